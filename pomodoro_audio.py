@@ -0,0 +1,332 @@
+"""
+Audio helpers for PyModoro: duration probing from container headers, the
+on-disk track metadata cache, and the volume envelope that ducks music
+under an alarm.
+"""
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+
+# ---------------- Duration probing ----------------
+_MP3_BITRATES = {
+    # (mpeg1, layer) -> kbps by bitrate index
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+_MP3_CBR_SAMPLE = 32  # frames that must agree on bitrate before trusting a CBR estimate
+_MP3_WINDOW = 65536   # bytes read after the ID3 tag to find the first frame and its tag
+
+def _mp3_header(buf, i):
+    """
+    Parse the MPEG audio frame header at buf[i].
+
+    Returns:
+    - tuple or None: (frame_len, samples_per_frame, sample_rate, bitrate_bps,
+      mpeg1, mono) or None if buf[i] is not a valid header
+    """
+    if i + 4 > len(buf) or buf[i] != 0xFF or (buf[i+1] & 0xE0) != 0xE0:
+        return None
+    version = (buf[i+1] >> 3) & 3
+    layer = 4 - ((buf[i+1] >> 1) & 3)
+    br_idx = buf[i+2] >> 4
+    sr_idx = (buf[i+2] >> 2) & 3
+    if version == 1 or layer == 4 or br_idx in (0, 15) or sr_idx == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][br_idx] * 1000
+    rate = _MP3_RATES[version][sr_idx]
+    pad = (buf[i+2] >> 1) & 1
+    mono = (buf[i+3] >> 6) == 3
+    if layer == 1:
+        return ((12 * bitrate // rate + pad) * 4, 384, rate, bitrate, mpeg1, mono)
+    samples = 1152 if (layer == 2 or mpeg1) else 576
+    return (samples // 8 * bitrate // rate + pad, samples, rate, bitrate, mpeg1, mono)
+
+def _mp3_duration(path):
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(max(0, size - 128))
+        end = size - (128 if f.read(3) == b"TAG" else 0)
+        f.seek(0)
+        head = f.read(10)
+        start = 0
+        if head[:3] == b"ID3" and len(head) == 10:
+            tag = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            start = 10 + tag + (10 if head[5] & 0x10 else 0)
+        f.seek(start)
+        buf = f.read(_MP3_WINDOW)
+        # Find the first frame whose successor is also a valid header.
+        i = 0
+        hdr = None
+        while i < len(buf) - 4:
+            hdr = _mp3_header(buf, i)
+            if hdr and _mp3_header(buf, i + hdr[0]):
+                break
+            hdr = None
+            i = buf.find(b"\xff", i + 1)
+            if i < 0:
+                return 0.0
+        if hdr is None:
+            return 0.0
+        frame_len, samples, rate, bitrate, mpeg1, mono = hdr
+        # Xing/Info (LAME) and VBRI tags carry the exact frame count.
+        side = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+        x = i + 4 + side
+        if buf[x:x+4] in (b"Xing", b"Info") and struct.unpack(">I", buf[x+4:x+8])[0] & 1:
+            return struct.unpack(">I", buf[x+8:x+12])[0] * samples / rate
+        v = i + 36
+        if buf[v:v+4] == b"VBRI":
+            return struct.unpack(">I", buf[v+14:v+18])[0] * samples / rate
+        audio_bytes = end - (start + i)
+        # No tag: if the first frames agree on bitrate, treat it as CBR.
+        j = i
+        for _ in range(_MP3_CBR_SAMPLE):
+            h = _mp3_header(buf, j)
+            if h is None or h[3] != bitrate:
+                break
+            j += h[0]
+        else:
+            return audio_bytes * 8 / bitrate
+        # Untagged VBR: walk every frame header (still no decoding).
+        f.seek(start + i)
+        buf = f.read(audio_bytes)
+    total = 0.0
+    j = 0
+    while True:
+        h = _mp3_header(buf, j)
+        if h is None:
+            return total
+        total += h[1] / h[2]
+        j += h[0]
+
+def _wav_duration(path):
+    with open(path, "rb") as f:
+        head = f.read(12)
+        if head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+            return 0.0
+        byte_rate = 0
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return 0.0
+            cid, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if cid == b"fmt ":
+                fmt = f.read(size)
+                byte_rate = struct.unpack("<I", fmt[8:12])[0]
+                if size & 1: f.seek(1, 1)
+            elif cid == b"data":
+                return size / byte_rate if byte_rate else 0.0
+            else:
+                f.seek(size + (size & 1), 1)
+
+def _ogg_duration(path):
+    with open(path, "rb") as f:
+        head = f.read(4096)
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(max(0, size - 65536))
+        tail = f.read()
+    if head[:4] != b"OggS":
+        return 0.0
+    rate, preskip = 0, 0
+    k = head.find(b"\x01vorbis")
+    if k >= 0:
+        rate = struct.unpack("<I", head[k+12:k+16])[0]
+    else:
+        k = head.find(b"OpusHead")
+        if k < 0:
+            return 0.0
+        rate = 48000  # Opus granule positions are always 48 kHz
+        preskip = struct.unpack("<H", head[k+10:k+12])[0]
+    last = tail.rfind(b"OggS")
+    if last < 0 or not rate:
+        return 0.0
+    granule = struct.unpack("<q", tail[last+6:last+14])[0]
+    return max(0.0, (granule - preskip) / rate)
+
+_PROBERS = {".mp3": _mp3_duration, ".wav": _wav_duration, ".ogg": _ogg_duration}
+
+def probe_duration(path):
+    """
+    Read a track's duration from its container headers without decoding audio.
+
+    MP3 uses the Xing/Info or VBRI tag when present and otherwise walks frame
+    headers; WAV reads the fmt/data chunks; OGG reads the last page's granule
+    position (Vorbis and Opus).
+
+    Parameters:
+    - path (str or Path): audio file
+    Returns:
+    - float: duration in seconds, or 0.0 if the headers could not be parsed
+    """
+    prober = _PROBERS.get(os.path.splitext(str(path))[1].lower())
+    if prober is None:
+        return 0.0
+    try:
+        return float(prober(path))
+    except Exception:
+        return 0.0
+
+# ---------------- Volume envelope ----------------
+class VolumeEnvelope:
+    """
+    Piecewise-linear gain curve over absolute timestamps.
+
+    Keyframes are (time, gain) pairs. gain_at() interpolates between them and
+    holds the first/last gain outside the curve; next_change() says when the
+    gain next needs updating, so callers can sleep until then instead of
+    polling every frame.
+    """
+    def __init__(self):
+        self.points = []
+
+    def set(self, points):
+        self.points = sorted(points)
+
+    def gain_at(self, t):
+        pts = self.points
+        if not pts: return 1.0
+        if t <= pts[0][0]: return pts[0][1]
+        for (t0, g0), (t1, g1) in zip(pts, pts[1:]):
+            if t < t1:
+                return g0 + (g1 - g0) * (t - t0) / (t1 - t0)
+        return pts[-1][1]
+
+    def next_change(self, t, step):
+        """
+        Parameters:
+        - t (float): current time
+        - step (float): update interval while a ramp is in progress
+        Returns:
+        - float or None: next time the gain should be re-applied, or None once
+          the curve is finished
+        """
+        pts = self.points
+        if not pts: return None
+        if t < pts[0][0]: return pts[0][0]
+        for (t0, g0), (t1, g1) in zip(pts, pts[1:]):
+            if t < t1:
+                return min(t + step, t1) if g0 != g1 else t1
+        return None
+
+# ---------------- Track metadata cache ----------------
+class TrackCache:
+    """
+    On-disk cache of track metadata, validated against each file's size and mtime.
+
+    Stores per-track {"size", "mtime", "duration", "title"} plus each scanned
+    folder's listing keyed by the folder's mtime, so a warm library is listed
+    without iterating the folder and durations are known without probing.
+    Safe to share between the UI thread and the audio loader thread.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._tracks = {}
+        self._dirs = {}
+        self._loaded = False
+        self._dirty = False
+
+    def load(self):
+        with self._lock:
+            self._loaded = True
+            try:
+                if self.path.exists():
+                    model = json.loads(self.path.read_text(encoding="utf-8"))
+                    self._tracks = dict(model.get("tracks", {}))
+                    self._dirs = dict(model.get("dirs", {}))
+            except Exception:
+                self._tracks, self._dirs = {}, {}
+
+    def save(self):
+        with self._lock:
+            if not self._dirty: return
+            try:
+                self.path.parent.mkdir(exist_ok=True)
+                self.path.write_text(json.dumps({"dirs": self._dirs, "tracks": self._tracks}, indent=2), encoding="utf-8")
+                self._dirty = False
+            except Exception:
+                pass
+
+    def _listing(self, folder, exts):
+        """(file names, subdirectory names) of folder, reused while its mtime is unchanged."""
+        with self._lock:
+            if not self._loaded: self.load()
+            key = str(folder)
+            mtime = folder.stat().st_mtime_ns
+            entry = self._dirs.get(key)
+            if entry and entry.get("mtime") == mtime and "dirs" in entry:
+                return entry["names"], entry["dirs"]
+            names, dirs = [], []
+            with os.scandir(folder) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        dirs.append(e.name)
+                    elif e.is_file() and os.path.splitext(e.name)[1].lower() in exts:
+                        names.append(e.name)
+            names.sort()
+            dirs.sort()
+            self._dirs[key] = {"mtime": mtime, "names": names, "dirs": dirs}
+            keep = {str(folder / n) for n in names}
+            for k in [k for k in self._tracks if str(Path(k).parent) == key and k not in keep]:
+                del self._tracks[k]
+            self._dirty = True
+            return names, dirs
+
+    def walk(self, root, exts):
+        """
+        Yield audio files under root, depth-first and sorted within each folder.
+        One folder is listed at a time, so callers can use the first tracks
+        while the rest of a large tree is still being scanned.
+
+        Parameters:
+        - root (Path): top folder
+        - exts (set): lower-case suffixes to keep
+        """
+        stack = [Path(root)]
+        while stack:
+            folder = stack.pop()
+            try:
+                names, dirs = self._listing(folder, exts)
+            except OSError:
+                continue
+            for n in names:
+                yield folder / n
+            stack.extend(folder / d for d in reversed(dirs))
+
+    def lookup(self, path, probe=probe_duration):
+        """
+        Parameters:
+        - path (Path): audio file
+        - probe (callable): path -> duration seconds, used on a cache miss
+        Returns:
+        - dict: {"size", "mtime", "duration", "title"}; duration is 0.0 if unknown
+        """
+        path = Path(path)
+        key = str(path)
+        try:
+            st = path.stat()
+        except OSError:
+            return {"size": 0, "mtime": 0, "duration": 0.0, "title": path.stem}
+        with self._lock:
+            if not self._loaded: self.load()
+            entry = self._tracks.get(key)
+            if entry and entry.get("size") == st.st_size and entry.get("mtime") == st.st_mtime_ns:
+                return entry
+        # Probing reads the file; other threads keep using the cache meanwhile.
+        entry = {"size": st.st_size, "mtime": st.st_mtime_ns, "duration": float(probe(path)), "title": path.stem}
+        with self._lock:
+            self._tracks[key] = entry
+            self._dirty = True
+        return entry
+
+    def duration(self, path, probe=probe_duration):
+        return self.lookup(path, probe)["duration"]
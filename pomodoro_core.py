@@ -0,0 +1,303 @@
+"""
+GUI-free core of PyModoro: paths, models, persistence and the timer engine.
+
+Importing this module does not touch pygame, so scripts and tools can use
+TimerEngine and the load_/save_ helpers without starting a display or mixer.
+"""
+import csv
+import json
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from time import monotonic
+
+# ---------------- Paths ----------------
+ROOT = Path(__file__).parent
+DATA = ROOT / "data"
+ASSETS = ROOT / "assets"
+SOUNDS = ASSETS / "sounds"
+CONFIG_FILE = DATA / "config.json"
+COUNTERS_FILE = DATA / "counters.csv"
+TASKS_FILE = DATA / "tasks.json"
+TRACK_CACHE_FILE = DATA / "track_cache.json"
+CACHE_DIR = DATA / "cache"
+
+# ---------------- Models ----------------
+@dataclass
+class Config:
+    """
+    Application configuration settings.
+
+    Attributes:
+    - focus_level (str): "Traditional" or "Custom" set of durations.
+    - pomodoro_min (int): Default pomodoro minutes for Traditional mode.
+    - short_min (int): Default short break minutes for Traditional mode.
+    - long_min (int): Default long break minutes for Traditional mode.
+    - custom_pomodoro_min (int): Custom pomodoro minutes for Custom mode.
+    - custom_short_min (int): Custom short break minutes for Custom mode.
+    - custom_long_min (int): Custom long break minutes for Custom mode.
+    - auto_start_pomodoros (bool): Auto-start focus after breaks.
+    - auto_start_breaks (bool): Auto-start breaks after focus.
+    - alarm_index (int): Index into available alarm sounds.
+    - mute (bool): True to mute alarms.
+    - long_break_every (int): After how many pomodoros to take a long break.
+    - music_crossfade_ms (int): Fade between songs in ms; 0 plays them gaplessly.
+    - music_shuffle (bool): Shuffle songs as they are discovered.
+    - alarm_fade_s (float): Seconds to fade music down before a session ends; 0 disables.
+    - alarm_duck (float): Music volume factor while the alarm plays.
+    - mixer_frequency (int): Mixer sample rate in Hz.
+    - mixer_buffer (int): Mixer buffer size in sample frames; smaller means lower
+      latency but more risk of underruns.
+    - mixer_channels (int): 1 for mono, 2 for stereo.
+    """
+    focus_level: str = "Traditional"  # "Traditional" | "Custom"
+    pomodoro_min: int = 25
+    short_min: int = 5
+    long_min: int = 15
+    custom_pomodoro_min: int = 25
+    custom_short_min: int = 5
+    custom_long_min: int = 15
+    auto_start_pomodoros: bool = False
+    auto_start_breaks: bool = False
+    alarm_index: int = 0
+    mute: bool = False
+    long_break_every: int = 4
+    music_crossfade_ms: int = 0
+    music_shuffle: bool = False
+    alarm_fade_s: float = 3.0
+    alarm_duck: float = 0.2
+    mixer_frequency: int = 44100
+    mixer_buffer: int = 512
+    mixer_channels: int = 2
+
+@dataclass
+class Counters:
+    """
+    Day/session counters.
+
+    Attributes:
+    - pomodoros (int): Completed pomodoro sessions.
+    - short_breaks (int): Completed short breaks.
+    - long_breaks (int): Completed long breaks.
+    """
+    pomodoros: int = 0
+    short_breaks: int = 0
+    long_breaks: int = 0
+
+# ---------------- Persistence ----------------
+def load_config() -> Config:
+    """
+    Load configuration from CONFIG_FILE.
+
+    Returns:
+    - Config: Loaded configuration, or defaults on error/missing file.
+    """
+    try:
+        if CONFIG_FILE.exists():
+            return Config(**json.loads(CONFIG_FILE.read_text(encoding="utf-8")))
+    except Exception:
+        pass
+    return Config()
+
+def save_config(cfg: Config):
+    """
+    Save configuration to CONFIG_FILE.
+
+    Parameters:
+    - cfg (Config): Configuration to persist.
+    """
+    try:
+        DATA.mkdir(exist_ok=True)
+        CONFIG_FILE.write_text(json.dumps(asdict(cfg), indent=2), encoding="utf-8")
+    except Exception:
+        pass
+
+def load_counters() -> Counters:
+    """
+    Load the last counters entry from COUNTERS_FILE (CSV).
+
+    Returns:
+    - Counters: Counters from last row, or defaults if not found/failed.
+    """
+    try:
+        if COUNTERS_FILE.exists():
+            with COUNTERS_FILE.open("r", newline="", encoding="utf-8") as f:
+                r = csv.DictReader(f)
+                rows = list(r)
+                if rows:
+                    row = rows[-1]
+                    return Counters(
+                        pomodoros=int(row.get("pomodoros", 0)),
+                        short_breaks=int(row.get("short_breaks", 0)),
+                        long_breaks=int(row.get("long_breaks", 0)),
+                    )
+    except Exception:
+        pass
+    return Counters()
+
+def save_counters(cnt: Counters):
+    """
+    Append counters as a row to COUNTERS_FILE.
+
+    Parameters:
+    - cnt (Counters): Counters snapshot to append.
+    """
+    try:
+        DATA.mkdir(exist_ok=True)
+        write_header = not COUNTERS_FILE.exists()
+        with COUNTERS_FILE.open("a", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=["pomodoros","short_breaks","long_breaks"])
+            if write_header:
+                w.writeheader()
+            w.writerow(asdict(cnt))
+    except Exception:
+        pass
+
+def load_tasks():
+    """
+    Load tasks model from TASKS_FILE.
+
+    Returns:
+    - dict: Model with keys "tasks" (list) and "hide_completed" (bool).
+    """
+    try:
+        if TASKS_FILE.exists():
+            return json.loads(TASKS_FILE.read_text(encoding="utf-8"))
+    except Exception:
+        pass
+    return {"tasks": [], "hide_completed": False}
+
+def save_tasks(model):
+    """
+    Persist tasks model to TASKS_FILE.
+
+    Parameters:
+    - model (dict): Tasks model to save.
+    """
+    try:
+        DATA.mkdir(exist_ok=True)
+        TASKS_FILE.write_text(json.dumps(model, indent=2), encoding="utf-8")
+    except Exception:
+        pass
+
+def _sanitized_tasks_model(model):
+    out = {"tasks": [], "hide_completed": model.get("hide_completed", False)}
+    for t in model.get("tasks", []):
+        clean = {k: v for k, v in t.items() if not (isinstance(k, str) and k.startswith("_"))}
+        out["tasks"].append(clean)
+    return out
+
+# ---------------- Timer engine ----------------
+class TimerEngine:
+    """
+    Pomodoro/break countdown.
+
+    While running the engine only stores the absolute deadline on a monotonic
+    clock, so `remaining` is computed on demand and cannot drift with frame
+    timing or wall-clock jumps; while paused it stores the frozen remainder.
+    `running` and `remaining` can be assigned directly and keep both in step.
+
+    Parameters:
+    - cfg (Config): durations and auto-start settings
+    - clock (callable): monotonic seconds source, time.monotonic by default
+    """
+    def __init__(self, cfg: Config, clock=monotonic):
+        self.cfg = cfg
+        self.clock = clock
+        self.mode = "Pomodoro"  # "Pomodoro" | "Short Break" | "Long Break"
+        self._deadline = None   # clock() value at which the session ends, while running
+        self._left = self._mode_seconds()  # frozen remainder, while paused
+        self.cycle_done = 0
+
+    @property
+    def running(self) -> bool:
+        return self._deadline is not None
+
+    @running.setter
+    def running(self, value: bool):
+        if value and self._deadline is None:
+            self._deadline = self.clock() + self._left
+        elif not value and self._deadline is not None:
+            self._left = max(0.0, self._deadline - self.clock())
+            self._deadline = None
+
+    @property
+    def remaining(self) -> float:
+        if self._deadline is None:
+            return self._left
+        return max(0.0, self._deadline - self.clock())
+
+    @remaining.setter
+    def remaining(self, value: float):
+        if self._deadline is None:
+            self._left = value
+        else:
+            self._deadline = self.clock() + value
+
+    @property
+    def deadline(self):
+        """clock() time at which the running session ends, or None while paused."""
+        return self._deadline
+
+    def _triplet(self):
+        if self.cfg.focus_level == "Traditional":
+            return (self.cfg.pomodoro_min, self.cfg.short_min, self.cfg.long_min)
+        return (self.cfg.custom_pomodoro_min, self.cfg.custom_short_min, self.cfg.custom_long_min)
+
+    def _mode_seconds(self):
+        p, s, l = self._triplet()
+        return (p if self.mode=="Pomodoro" else s if self.mode=="Short Break" else l) * 60
+
+    def set_mode(self, m: str):
+        self.mode = m
+        self.running = False
+        self.remaining = self._mode_seconds()
+
+    def start(self): self.running = True
+    def pause(self): self.running = False
+
+    def stop(self):
+        self.running = False
+        self.remaining = self._mode_seconds()
+
+    def skip_to_pomodoro(self):
+        self.mode = "Pomodoro"
+        self.remaining = self._mode_seconds()
+        self.running = True
+
+    def skip_to_break(self):
+        next_is_long = (self.cycle_done + 1) % self.cfg.long_break_every == 0
+        self.mode = "Long Break" if next_is_long else "Short Break"
+        self.remaining = self._mode_seconds()
+        self.running = True
+
+    def tick(self, dt_sec: float = None) -> bool:
+        """
+        Check for completion. dt_sec is ignored; it is accepted so older callers keep working.
+
+        Returns:
+        - bool: True once when the running session reaches its deadline
+        """
+        if self._deadline is None or self.clock() < self._deadline: return False
+        self._deadline = None
+        self._left = 0
+        return True
+
+    def on_complete(self, counters: Counters):
+        if self.mode == "Pomodoro":
+            counters.pomodoros += 1
+            self.cycle_done += 1
+            if self.cfg.auto_start_breaks:
+                self.skip_to_break()
+            else:
+                next_is_long = (self.cycle_done) % self.cfg.long_break_every == 0
+                self.mode = "Long Break" if next_is_long else "Short Break"
+                self.remaining = self._mode_seconds()
+        elif self.mode == "Short Break":
+            counters.short_breaks += 1
+            self.mode = "Pomodoro"; self.remaining = self._mode_seconds()
+            if self.cfg.auto_start_pomodoros: self.running = True
+        else:
+            counters.long_breaks += 1
+            self.cycle_done = 0
+            self.mode = "Pomodoro"; self.remaining = self._mode_seconds()
+            if self.cfg.auto_start_pomodoros: self.running = True
@@ -0,0 +1,273 @@
+"""
+Headless PyModoro daemon.
+
+Runs one TimerEngine with the saved Config and Counters and serves it over a
+Unix domain socket, so scripts and editors can drive the timer without the
+pygame window. There is no render loop: completion is a single asyncio
+timer armed at the engine's deadline.
+
+Protocol: one command per line, one reply line per command.
+
+    start | pause | stop | skip [pomodoro|break] | status | watch | quit
+
+Replies are "ok <status>" or "err <message>", where status reads
+"mode=<pomodoro|short|long> running=<0|1> remaining=<seconds>
+pomodoros=<n> short=<n> long=<n>". After "watch", the connection also
+receives "event <name> <status>" lines on every state change
+(start, pause, stop, skip, complete).
+
+    python pomodoro_daemon.py                 # serve on SOCKET_FILE
+    python pomodoro_daemon.py --send status   # one-shot client
+"""
+import asyncio
+import os
+import signal
+import socket
+from pathlib import Path
+
+from pomodoro_core import (
+    DATA, Config, Counters, TimerEngine,
+    load_config, load_counters, save_counters,
+)
+
+SOCKET_FILE = DATA / "pomodoro.sock"
+WATCH_BUFFER_MAX = 64 * 1024  # bytes queued for a watcher before it is dropped
+LISTEN_BACKLOG = 1024          # pending connections; bursts of hundreds of clients are expected
+MODE_NAMES = {"Pomodoro": "pomodoro", "Short Break": "short", "Long Break": "long"}
+
+def format_status(engine: TimerEngine, counters: Counters):
+    """
+    Parameters:
+    - engine (TimerEngine): timer to describe
+    - counters (Counters): session totals
+    Returns:
+    - str: one-line "key=value" status
+    """
+    return (f"mode={MODE_NAMES.get(engine.mode, engine.mode)} running={int(engine.running)} "
+            f"remaining={int(engine.remaining)} pomodoros={counters.pomodoros} "
+            f"short={counters.short_breaks} long={counters.long_breaks}")
+
+def apply_command(engine: TimerEngine, cmd, args=()):
+    """
+    Apply one timer command, the same way the window's buttons do.
+
+    Parameters:
+    - engine (TimerEngine): timer to drive
+    - cmd (str): "start", "pause", "stop", "skip" or "status" (no change)
+    - args (sequence): optional skip target, "pomodoro" or "break"
+    Returns:
+    - str or None: error message, or None on success
+    """
+    if cmd == "start":
+        if engine.remaining <= 0:
+            engine.remaining = engine._mode_seconds()
+        engine.start()
+    elif cmd == "pause":
+        engine.pause()
+    elif cmd == "stop":
+        engine.stop()
+    elif cmd == "skip":
+        target = str(args[0]).lower() if args else ("break" if engine.mode == "Pomodoro" else "pomodoro")
+        if target == "break":
+            engine.skip_to_break()
+        elif target == "pomodoro":
+            engine.skip_to_pomodoro()
+        else:
+            return f"unknown skip target {target!r}"
+    elif cmd != "status":
+        return f"unknown command {cmd!r}"
+    return None
+
+class PomodoroDaemon:
+    """
+    Serve a TimerEngine over a Unix socket.
+
+    Parameters:
+    - cfg (Config): settings; loaded from CONFIG_FILE when None
+    - counters (Counters): totals; loaded from COUNTERS_FILE when None
+    """
+    def __init__(self, cfg: Config = None, counters: Counters = None):
+        self.cfg = cfg if cfg is not None else load_config()
+        self.counters = counters if counters is not None else load_counters()
+        self.engine = TimerEngine(self.cfg)
+        self._watchers = set()
+        self._clients = {}  # writer -> handler task
+        self._deadline_handle = None
+
+    # Timer
+    def _arm(self):
+        """Arm one loop callback at the engine's deadline (or none while paused)."""
+        if self._deadline_handle is not None:
+            self._deadline_handle.cancel()
+            self._deadline_handle = None
+        if self.engine.running:
+            loop = asyncio.get_running_loop()
+            self._deadline_handle = loop.call_later(self.engine.remaining, self._on_deadline)
+
+    def _on_deadline(self):
+        self._deadline_handle = None
+        if self.engine.tick():
+            self.engine.on_complete(self.counters)
+            save_counters(self.counters)
+            self._broadcast("complete")
+        self._arm()
+
+    def _broadcast(self, name):
+        if not self._watchers: return
+        data = f"event {name} {format_status(self.engine, self.counters)}\n".encode()
+        for writer in list(self._watchers):
+            if writer.transport.get_write_buffer_size() > WATCH_BUFFER_MAX:
+                # A watcher that stopped reading must not hold the daemon's memory.
+                self._watchers.discard(writer)
+                writer.close()
+                continue
+            writer.write(data)
+
+    # Commands
+    def _apply(self, line):
+        """Run one command; return (reply line, event to broadcast or None)."""
+        parts = line.split()
+        if not parts:
+            return "err empty command", None
+        cmd = parts[0].lower()
+        error = apply_command(self.engine, cmd, parts[1:])
+        if error:
+            return "err " + error, None
+        if cmd == "status":
+            return "ok " + format_status(self.engine, self.counters), None
+        self._arm()
+        return "ok " + format_status(self.engine, self.counters), cmd
+
+    def handle(self, line):
+        """
+        Run one protocol command and tell the watchers.
+
+        Parameters:
+        - line (str): command line without the newline
+        Returns:
+        - str: reply line without the newline
+        """
+        reply, event = self._apply(line)
+        if event:
+            self._broadcast(event)
+        return reply
+
+    async def _client(self, reader, writer):
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    raw = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not raw:
+                    break
+                line = raw.decode("utf-8", "replace").strip()
+                if line.lower() == "quit":
+                    break
+                event = None
+                if line.lower() == "watch":
+                    self._watchers.add(writer)
+                    reply = "ok " + format_status(self.engine, self.counters)
+                else:
+                    reply, event = self._apply(line)
+                # The sender's reply goes out before its own event, so a watching
+                # client still reads exactly one reply line per command first.
+                writer.write((reply + "\n").encode())
+                if event:
+                    self._broadcast(event)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._watchers.discard(writer)
+            self._clients.pop(writer, None)
+            writer.close()
+
+    async def serve(self, path=SOCKET_FILE):
+        """
+        Listen on path until SIGINT/SIGTERM, then save counters and remove the socket.
+
+        Parameters:
+        - path (Path): socket file; a stale one is replaced
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            if _socket_alive(path):
+                raise RuntimeError(f"another daemon is listening on {path}")
+            path.unlink()
+        server = await asyncio.start_unix_server(self._client, path=str(path), backlog=LISTEN_BACKLOG)
+        os.chmod(path, 0o600)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        self._arm()
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if self._deadline_handle is not None:
+                self._deadline_handle.cancel()
+            # Closing the transports ends each handler's readline() with EOF.
+            tasks = list(self._clients.values())
+            for writer in list(self._clients):
+                writer.close()
+            if tasks:
+                await asyncio.wait(tasks, timeout=1.0)
+            save_counters(self.counters)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+def _socket_alive(path):
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        s.close()
+
+def send(command, path=SOCKET_FILE, timeout=5.0):
+    """
+    Send one command to a running daemon.
+
+    Parameters:
+    - command (str): protocol command, e.g. "status"
+    - path (Path): daemon socket
+    Returns:
+    - str: the reply line
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(path))
+        s.sendall((command.strip() + "\n").encode())
+        return s.makefile("r", encoding="utf-8").readline().rstrip("\n")
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    ap = argparse.ArgumentParser(description="PyModoro headless daemon")
+    ap.add_argument("--socket", type=Path, default=SOCKET_FILE, help=f"socket path (default {SOCKET_FILE})")
+    ap.add_argument("--send", metavar="CMD", help="send one command to a running daemon and print the reply")
+    args = ap.parse_args()
+    if args.send is not None:
+        try:
+            reply = send(args.send, args.socket)
+        except OSError as e:
+            print(f"err {e}", file=sys.stderr)
+            sys.exit(1)
+        print(reply)
+        sys.exit(0 if reply.startswith("ok") else 1)
+    try:
+        asyncio.run(PomodoroDaemon().serve(args.socket))
+    except RuntimeError as e:
+        print(f"err {e}", file=sys.stderr)
+        sys.exit(1)
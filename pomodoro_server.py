@@ -0,0 +1,414 @@
+"""
+Multi-user PyModoro server for a shared team-focus board.
+
+Each user has their own Config, TimerEngine and Counters. Deadlines are held
+in a TimerWheel, and state changes (start/pause/stop/skip, mode switches on
+completion, and remaining-time updates every `granularity` seconds) are
+pushed to WebSocket subscribers.
+
+Endpoints:
+- GET /ws?user=<id>   subscribe to one user's updates
+- GET /ws             subscribe to the whole board
+- GET /status         JSON snapshot of every user (plain HTTP)
+
+Messages to the server are JSON text frames:
+    {"cmd": "start" | "pause" | "stop" | "skip" | "status", "user": "<id>", "target": "break"}
+Messages from the server are JSON text frames:
+    {"type": "state", "updates": [{"user", "event", "mode", "running", "remaining",
+                                   "pomodoros", "short", "long"}, ...]}
+    {"type": "error", "message": "..."}
+
+Changes are batched over BATCH_WINDOW seconds: each flush serializes and
+frames one message per changed user plus one board message, and writes the
+same bytes to every subscriber of it. New users are capped at MAX_USERS in
+total and MAX_USERS_PER_CONNECTION per WebSocket connection; saved users
+count towards the total.
+
+    python pomodoro_server.py --port 8765 --granularity 1
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import re
+import signal
+import struct
+from dataclasses import asdict
+from urllib.parse import parse_qs, urlsplit
+
+from pomodoro_core import DATA, Config, Counters, TimerEngine
+from pomodoro_daemon import MODE_NAMES, apply_command
+from pomodoro_sched import TimerWheel
+
+USERS_FILE = DATA / "server_users.json"
+SEND_BUFFER_MAX = 256 * 1024  # bytes queued for a subscriber before it is dropped
+MAX_FRAME = 64 * 1024         # largest client message accepted
+SAVE_DELAY = 2.0              # seconds to coalesce counter saves
+BATCH_WINDOW = 0.05           # seconds to coalesce state pushes into one flush
+MAX_USERS = 10000             # users the server will hold
+MAX_USERS_PER_CONNECTION = 32 # users one connection may create
+_USER_ID = re.compile(r"[A-Za-z0-9_.-]{1,64}")
+_WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# ---------------- WebSocket framing (RFC 6455, server side) ----------------
+def ws_frame(payload: bytes, opcode=0x1):
+    """Encode one unmasked, unfragmented server frame."""
+    n = len(payload)
+    if n < 126:
+        head = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return head + payload
+
+async def ws_read(reader):
+    """
+    Read one client frame.
+
+    Returns:
+    - tuple: (opcode, payload bytes)
+    Raises:
+    - ConnectionError: on protocol violations or oversized frames
+    """
+    b0, b1 = await reader.readexactly(2)
+    if not b1 & 0x80:
+        raise ConnectionError("client frames must be masked")
+    n = b1 & 0x7F
+    if n == 126:
+        n = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if n > MAX_FRAME:
+        raise ConnectionError("frame too large")
+    mask = await reader.readexactly(4)
+    data = await reader.readexactly(n)
+    if n:
+        key = int.from_bytes((mask * (n // 4 + 1))[:n], "big")
+        data = (int.from_bytes(data, "big") ^ key).to_bytes(n, "big")
+    if not b0 & 0x80:
+        raise ConnectionError("fragmented messages are not supported")
+    return b0 & 0x0F, data
+
+# ---------------- Users ----------------
+class UserTimer:
+    """One board member: settings, timer, totals and WebSocket subscribers."""
+    def __init__(self, user_id, cfg: Config = None, counters: Counters = None):
+        self.id = user_id
+        self.cfg = cfg if cfg is not None else Config()
+        self.engine = TimerEngine(self.cfg)
+        self.counters = counters if counters is not None else Counters()
+        self.subscribers = set()  # StreamWriters
+
+    def state(self, event):
+        e = self.engine
+        return {"user": self.id, "event": event, "mode": MODE_NAMES.get(e.mode, e.mode),
+                "running": e.running, "remaining": int(e.remaining),
+                "pomodoros": self.counters.pomodoros, "short": self.counters.short_breaks,
+                "long": self.counters.long_breaks}
+
+# ---------------- Server ----------------
+class TimerServer:
+    """
+    Host per-user timers and push their changes to WebSocket subscribers.
+
+    Parameters:
+    - granularity (float): seconds between remaining-time updates for running
+      timers; 0 sends only discrete changes
+    - tick (float): TimerWheel resolution, i.e. how late a completion may be pushed
+    - max_users (int): cap on users held, including saved ones
+    - max_users_per_connection (int): cap on users one connection may create
+    """
+    def __init__(self, granularity=1.0, tick=0.1, max_users=MAX_USERS,
+                 max_users_per_connection=MAX_USERS_PER_CONNECTION):
+        self.granularity = granularity
+        self.max_users = max_users
+        self.max_users_per_connection = max_users_per_connection
+        self.wheel = TimerWheel(tick=tick)
+        self.users = {}
+        self.board = set()        # StreamWriters subscribed to every user
+        self._by_engine = {}      # TimerEngine -> UserTimer
+        self._pending = {}        # UserTimer -> last event since the previous flush
+        self._flush_handle = None
+        self._save_handle = None
+        self._wheel_wake = None   # asyncio.Event, created on the serving loop by serve()
+        self._stop = None         # likewise; set by close()
+        self._clients = {}        # StreamWriter -> handler task
+        self._created = {}        # StreamWriter -> users it created
+
+    # Users and persistence
+    def load(self):
+        try:
+            if USERS_FILE.exists():
+                model = json.loads(USERS_FILE.read_text(encoding="utf-8"))
+                for uid, rec in model.items():
+                    if _USER_ID.fullmatch(uid):
+                        self.user(uid, Config(**rec.get("config", {})), Counters(**rec.get("counters", {})))
+        except Exception:
+            pass
+
+    def save(self):
+        self._save_handle = None
+        try:
+            DATA.mkdir(exist_ok=True)
+            model = {u.id: {"config": asdict(u.cfg), "counters": asdict(u.counters)} for u in self.users.values()}
+            USERS_FILE.write_text(json.dumps(model), encoding="utf-8")
+        except Exception:
+            pass
+
+    def _save_soon(self):
+        if self._save_handle is None:
+            self._save_handle = asyncio.get_running_loop().call_later(SAVE_DELAY, self.save)
+
+    def user(self, user_id, cfg=None, counters=None):
+        u = self.users.get(user_id)
+        if u is None:
+            u = self.users[user_id] = UserTimer(user_id, cfg, counters)
+            self._by_engine[u.engine] = u
+        return u
+
+    def _claim(self, user_id, writer=None):
+        """
+        Existing user, or a new one if the user caps allow it.
+
+        Parameters:
+        - user_id (str): validated user id
+        - writer (StreamWriter): connection asking, charged for a new user
+        Returns:
+        - tuple: (UserTimer or None, error message or None)
+        """
+        u = self.users.get(user_id)
+        if u is not None:
+            return u, None
+        if len(self.users) >= self.max_users:
+            return None, "user limit reached"
+        if writer is not None:
+            n = self._created.get(writer, 0)
+            if n >= self.max_users_per_connection:
+                return None, "too many new users from this connection"
+            self._created[writer] = n + 1
+        return self.user(user_id), None
+
+    # Commands
+    def command(self, msg, writer=None):
+        """
+        Apply a decoded client message.
+
+        Parameters:
+        - msg (dict): decoded JSON message
+        - writer (StreamWriter): sending connection, for the per-connection user cap
+        Returns:
+        - str or None: error message, or None on success
+        """
+        if not isinstance(msg, dict):
+            return "expected a JSON object"
+        uid, cmd = msg.get("user"), str(msg.get("cmd", "")).lower()
+        if not isinstance(uid, str) or not _USER_ID.fullmatch(uid):
+            return "missing or invalid user"
+        u, error = self._claim(uid, writer)
+        if error:
+            return error
+        error = apply_command(u.engine, cmd, [msg["target"]] if "target" in msg else [])
+        if error or cmd == "status":
+            return error
+        self.wheel.schedule(u.engine, u.counters)
+        if u.engine.running and self._wheel_wake is not None:
+            self._wheel_wake.set()
+        self._mark(u, cmd)
+        return None
+
+    # Fan-out
+    def _mark(self, u, event):
+        """
+        Queue u's state for the next flush; all changes within BATCH_WINDOW share
+        one flush. A "tick" never replaces a pending change, so starts, mode
+        switches and completions are always announced.
+        """
+        if event != "tick" or u not in self._pending:
+            self._pending[u] = event
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(BATCH_WINDOW, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        board = []
+        for u, event in pending.items():
+            update = u.state(event)
+            board.append(update)
+            if u.subscribers:
+                self._send(u.subscribers, {"type": "state", "updates": [update]})
+        if board and self.board:
+            self._send(self.board, {"type": "state", "updates": board})
+
+    def _send(self, writers, message):
+        """Serialize and frame message once, then write the same bytes to every writer."""
+        frame = ws_frame(json.dumps(message, separators=(",", ":")).encode())
+        for w in list(writers):
+            if w.transport.is_closing() or w.transport.get_write_buffer_size() > SEND_BUFFER_MAX:
+                self._unsubscribe(w)
+                w.close()
+                continue
+            w.write(frame)
+
+    def _unsubscribe(self, w):
+        self.board.discard(w)
+        for u in self.users.values():
+            u.subscribers.discard(w)
+
+    # Background tasks
+    async def _run_wheel(self):
+        """Advance the wheel while it holds timers; sleep on an event when it is empty."""
+        while True:
+            if not len(self.wheel):
+                self._wheel_wake.clear()
+                await self._wheel_wake.wait()
+            await asyncio.sleep(self.wheel.tick)
+            for engine in self.wheel.advance():
+                u = self._by_engine[engine]
+                self._mark(u, "complete")
+                self._save_soon()
+
+    async def _run_ticker(self):
+        """Push remaining time for every running timer once per granularity step."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            await asyncio.sleep(self.granularity - now % self.granularity)
+            if not (self.board or any(u.subscribers for u in self.users.values())):
+                continue
+            for u in self.users.values():
+                if u.engine.running and (self.board or u.subscribers):
+                    self._mark(u, "tick")
+
+    # Connections
+    async def _client(self, reader, writer):
+        self._clients[writer] = asyncio.current_task()
+        try:
+            await self._session(reader, writer)
+        finally:
+            self._clients.pop(writer, None)
+            self._created.pop(writer, None)
+            self._unsubscribe(writer)
+            writer.close()
+
+    async def _session(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            return
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        headers = {}
+        for line in lines[1:]:
+            k, _, v = line.partition(":")
+            headers[k.strip().lower()] = v.strip()
+        url = urlsplit(parts[1] if len(parts) > 1 else "/")
+        if url.path == "/status":
+            body = json.dumps({"users": [u.state("status") for u in self.users.values()]}).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n"
+                         b"Connection: close\r\n\r\n" % len(body) + body)
+            await writer.drain()
+            return
+        key = headers.get("sec-websocket-key")
+        if url.path != "/ws" or headers.get("upgrade", "").lower() != "websocket" or not key:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            return
+        accept = base64.b64encode(hashlib.sha1(key.encode() + _WS_GUID).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                     b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        uid = parse_qs(url.query).get("user", [None])[0]
+        if uid is not None and _USER_ID.fullmatch(uid):
+            u, error = self._claim(uid, writer)
+            if error:
+                writer.write(ws_frame(json.dumps({"type": "error", "message": error}).encode()))
+                writer.write(ws_frame(struct.pack("!H", 1008), 0x8))  # policy violation
+                await writer.drain()
+                return
+            u.subscribers.add(writer)
+            writer.write(ws_frame(json.dumps({"type": "state", "updates": [u.state("hello")]}).encode()))
+        else:
+            self.board.add(writer)
+            writer.write(ws_frame(json.dumps(
+                {"type": "state", "updates": [u.state("hello") for u in self.users.values()]}).encode()))
+        try:
+            while True:
+                opcode, data = await ws_read(reader)
+                if opcode == 0x8:    # close
+                    writer.write(ws_frame(data[:2], 0x8))
+                    break
+                if opcode == 0x9:    # ping
+                    writer.write(ws_frame(data, 0xA))
+                elif opcode == 0x1:
+                    try:
+                        msg = json.loads(data)
+                        error = self.command(msg, writer)
+                    except ValueError:
+                        error = "invalid JSON"
+                    if error:
+                        writer.write(ws_frame(json.dumps({"type": "error", "message": error}).encode()))
+                    elif str(msg.get("cmd", "")).lower() == "status":
+                        # Status is a query: answer the asker only.
+                        update = self.users[msg["user"]].state("status")
+                        writer.write(ws_frame(json.dumps({"type": "state", "updates": [update]}).encode()))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def close(self):
+        """Ask a running serve() to shut down."""
+        if self._stop is not None:
+            self._stop.set()
+
+    async def serve(self, host="127.0.0.1", port=8765, started=None):
+        """
+        Serve until SIGINT/SIGTERM or close(), then save every user's config and counters.
+
+        Parameters:
+        - host (str), port (int): listen address; port 0 picks a free port
+        - started (callable): called with the bound (host, port) once listening
+        """
+        self.load()
+        # Events belong to the loop that awaits them (Python 3.9 binds at creation).
+        self._wheel_wake = asyncio.Event()
+        self._stop = stop = asyncio.Event()
+        server = await asyncio.start_server(self._client, host, port, backlog=1024)
+        if started is not None:
+            started(server.sockets[0].getsockname()[:2])
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        tasks = [asyncio.create_task(self._run_wheel())]
+        if self.granularity > 0:
+            tasks.append(asyncio.create_task(self._run_ticker()))
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            for t in tasks:
+                t.cancel()
+            # Closing the transports ends each handler's pending read.
+            handlers = list(self._clients.values())
+            for w in list(self._clients):
+                w.close()
+            if handlers:
+                await asyncio.wait(handlers, timeout=1.0)
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            if self._save_handle is not None:
+                self._save_handle.cancel()
+            self.save()
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="PyModoro multi-user timer server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--granularity", type=float, default=1.0,
+                    help="seconds between remaining-time pushes for running timers (0: only changes)")
+    args = ap.parse_args()
+    asyncio.run(TimerServer(granularity=args.granularity).serve(args.host, args.port))
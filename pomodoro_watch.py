@@ -0,0 +1,221 @@
+"""
+Folder watching for PyModoro's asset folders.
+
+FolderWatcher reports audio files added to or removed from a folder tree,
+using inotify on Linux and polling folder mtimes elsewhere. Its callback
+runs on the watcher thread.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+# ---------------- inotify ----------------
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+def _libc_inotify():
+    """libc with the inotify calls, or None where they are unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        libc.inotify_rm_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+# ---------------- Watcher ----------------
+class FolderWatcher:
+    """
+    Watch folder trees for files with the given suffixes being added or removed.
+
+    on_change(kind, path) is called from the watcher thread with kind "added"
+    or "removed". A removed path may be a folder, meaning everything under it.
+    "added" can repeat for a file that is rewritten in place, so receivers
+    should ignore paths they already know.
+
+    Parameters:
+    - roots (list[Path]): folders to watch recursively
+    - exts (set): lower-case suffixes to report, e.g. {".mp3"}
+    - on_change (callable): (kind, path) -> None
+    - poll_interval (float): seconds between folder checks in polling mode
+    """
+    def __init__(self, roots, exts, on_change, poll_interval=2.0):
+        self.roots = [Path(r) for r in roots]
+        self.exts = exts
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.backend = None  # "inotify" or "poll" once started
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        libc = _libc_inotify()
+        fd = libc.inotify_init1(_IN_CLOEXEC) if libc is not None else -1
+        if fd >= 0:
+            self.backend = "inotify"
+            target, args = self._run_inotify, (libc, fd)
+        else:
+            self.backend = "poll"
+            target, args = self._run_poll, ()
+        self._stop.clear()
+        self._thread = threading.Thread(target=target, args=args, name="folder-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _wanted(self, name):
+        return os.path.splitext(name)[1].lower() in self.exts
+
+    def _emit(self, kind, path):
+        try:
+            self.on_change(kind, path)
+        except Exception:
+            pass
+
+    # inotify: one watch per folder; new folders are watched as they appear.
+    def _run_inotify(self, libc, fd):
+        wds = {}  # watch descriptor -> folder
+
+        def watch(folder):
+            """Watch folder and its subfolders; return the files already inside them."""
+            found = []
+            stack = [folder]
+            while stack:
+                d = stack.pop()
+                wd = libc.inotify_add_watch(fd, os.fsencode(str(d)), _WATCH_MASK)
+                if wd < 0:
+                    continue
+                wds[wd] = d
+                try:
+                    with os.scandir(d) as it:
+                        for e in it:
+                            if e.is_dir(follow_symlinks=False):
+                                stack.append(Path(e.path))
+                            elif self._wanted(e.name):
+                                found.append(Path(e.path))
+                except OSError:
+                    pass
+            return found
+
+        def unwatch(folder):
+            for wd, d in list(wds.items()):
+                if d == folder or folder in d.parents:
+                    libc.inotify_rm_watch(fd, wd)
+                    del wds[wd]
+
+        for root in self.roots:
+            if root.is_dir():
+                watch(root)
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                buf = os.read(fd, 65536)
+                i = 0
+                while i + _EVENT.size <= len(buf):
+                    wd, mask, _cookie, n = _EVENT.unpack_from(buf, i)
+                    name = buf[i + _EVENT.size:i + _EVENT.size + n].split(b"\0", 1)[0]
+                    i += _EVENT.size + n
+                    if mask & _IN_Q_OVERFLOW:
+                        # Events were dropped: re-announce everything (receivers dedupe).
+                        for wd_old in list(wds):
+                            libc.inotify_rm_watch(fd, wd_old)
+                        wds.clear()
+                        for root in self.roots:
+                            if root.is_dir():
+                                for p in watch(root):
+                                    self._emit("added", p)
+                        continue
+                    if mask & _IN_IGNORED:
+                        wds.pop(wd, None)
+                        continue
+                    folder = wds.get(wd)
+                    if folder is None or not name:
+                        continue
+                    path = folder / os.fsdecode(name)
+                    if mask & _IN_ISDIR:
+                        if mask & (_IN_CREATE | _IN_MOVED_TO):
+                            for p in watch(path):
+                                self._emit("added", p)
+                        elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                            unwatch(path)
+                            self._emit("removed", path)
+                    elif self._wanted(path.name):
+                        if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                            self._emit("added", path)
+                        elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                            self._emit("removed", path)
+        finally:
+            os.close(fd)
+
+    # Polling: stat every known folder; only folders whose mtime moved are listed again.
+    def _run_poll(self):
+        snap = {}  # folder -> (mtime_ns, file names, subfolder names)
+
+        def drop(folder):
+            for d in [d for d in snap if d == folder or folder in d.parents]:
+                del snap[d]
+
+        def visit(folder, emit):
+            try:
+                mtime = folder.stat().st_mtime_ns
+                files, dirs = set(), set()
+                with os.scandir(folder) as it:
+                    for e in it:
+                        if e.is_dir(follow_symlinks=False):
+                            dirs.add(e.name)
+                        elif self._wanted(e.name):
+                            files.add(e.name)
+            except OSError:
+                return
+            _, old_files, old_dirs = snap.get(folder, (0, set(), set()))
+            snap[folder] = (mtime, files, dirs)
+            if emit:
+                for n in sorted(files - old_files):
+                    self._emit("added", folder / n)
+                for n in sorted(old_files - files):
+                    self._emit("removed", folder / n)
+            for n in old_dirs - dirs:
+                drop(folder / n)
+                if emit:
+                    self._emit("removed", folder / n)
+            for n in sorted(dirs - old_dirs):
+                visit(folder / n, emit)
+
+        for root in self.roots:
+            visit(root, False)
+        while not self._stop.wait(self.poll_interval):
+            for root in self.roots:
+                if root not in snap:
+                    visit(root, True)
+            for folder, (mtime, _, _) in list(snap.items()):
+                if folder not in snap:
+                    continue
+                try:
+                    changed = folder.stat().st_mtime_ns != mtime
+                except OSError:
+                    continue  # its parent reports the removal
+                if changed:
+                    visit(folder, True)
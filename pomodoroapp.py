@@ -1,22 +1,84 @@
 import pygame
 import sys
 import csv
-import json
+import io
 import math
-from dataclasses import dataclass, asdict
-from pathlib import Path
-from time import time
-
-pygame.init()
+import os
+import queue
+import random
+import threading
+import wave
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict
+from time import monotonic, perf_counter, sleep
+
+# Re-exported so code that imported these paths from pomodoroapp keeps working.
+from pomodoro_core import ROOT, DATA, CONFIG_FILE, TASKS_FILE  # noqa: F401
+from pomodoro_core import (
+    ASSETS, SOUNDS, COUNTERS_FILE, TRACK_CACHE_FILE, CACHE_DIR,
+    Config, Counters, TimerEngine,
+    load_config, save_config, load_counters, save_counters, load_tasks, save_tasks,
+    _sanitized_tasks_model,
+)
+from pomodoro_audio import TrackCache, VolumeEnvelope, probe_duration
+from pomodoro_watch import FolderWatcher
+
+# ---------------- Startup profiling ----------------
+STARTUP_BUDGET_MS = 750  # target from main() to the first presented frame
+
+class StartupProfiler:
+    """
+    Records a timestamped span per startup phase and prints them as a budget table.
 
-# ---------------- Paths ----------------
-ROOT = Path(__file__).parent
-DATA = ROOT / "data"; DATA.mkdir(exist_ok=True)
-ASSETS = ROOT / "assets"
-SOUNDS = ASSETS / "sounds"
-CONFIG_FILE = DATA / "config.json"
-COUNTERS_FILE = DATA / "counters.csv"
-TASKS_FILE = DATA / "tasks.json"
+    Spans nest: a span opened inside another is indented under it in the report.
+    """
+    def __init__(self):
+        self.t0 = perf_counter()
+        self.spans = []  # [name, depth, start_s, end_s]
+        self._depth = 0
+
+    def begin(self, name):
+        rec = [name, self._depth, perf_counter() - self.t0, None]
+        self.spans.append(rec)
+        self._depth += 1
+        return rec
+
+    def end(self, rec):
+        self._depth -= 1
+        rec[3] = perf_counter() - self.t0
+
+    @contextmanager
+    def span(self, name):
+        rec = self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(rec)
+
+    def report(self, budget_ms=STARTUP_BUDGET_MS):
+        """
+        Print every span with its start offset, duration and share of the total.
+
+        Parameters:
+        - budget_ms (float): startup budget the total is checked against
+        Returns:
+        - float: total startup time in milliseconds
+        """
+        top = [sp for sp in self.spans if sp[1] == 0 and sp[3] is not None]
+        total_ms = sum(sp[3] - sp[2] for sp in top) * 1000
+        print(f"{'phase':<40}{'start ms':>10}{'ms':>10}{'share':>8}")
+        for name, depth, start, end in self.spans:
+            if end is None: continue
+            ms = (end - start) * 1000
+            share = ms / total_ms * 100 if total_ms else 0.0
+            print(f"{'  ' * depth + name:<40}{start * 1000:>10.1f}{ms:>10.1f}{share:>7.1f}%")
+        verdict = "OK" if total_ms <= budget_ms else "OVER BUDGET"
+        print(f"{'total':<40}{'':>10}{total_ms:>10.1f}   budget {budget_ms:.0f} ms: {verdict}")
+        return total_ms
+
+STARTUP = StartupProfiler()
 
 # ---------------- Fonts ----------------
 def sysfont(names, size, bold=False):
@@ -31,13 +93,110 @@ def sysfont(names, size, bold=False):
     """
     return pygame.font.SysFont(names, size, bold=bold)
 
-FONT_BIG = sysfont(["Inter","SF Pro Display","Segoe UI","Arial"], 112, bold=True)
-FONT_MED = sysfont(["Inter","Segoe UI","Arial"], 20)
-FONT_UI = sysfont(["Inter","Segoe UI","Arial"], 16)
-FONT_TITLE = sysfont(["Helvetica"], 28, bold=True)
+# Created by init_fonts()
+FONT_BIG = None
+FONT_MED = None
+FONT_UI = None
+FONT_TITLE = None
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces.
+
+    Attributes:
+    - capacity (int): Maximum number of cached surfaces.
+    - hits (int): Lookups served from the cache.
+    - misses (int): Lookups that had to rasterize.
+    """
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._surfs = OrderedDict()
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, tuple(color), bool(antialias))
+        srf = self._surfs.get(key)
+        if srf is not None:
+            self._surfs.move_to_end(key)
+            self.hits += 1
+            return srf
+        self.misses += 1
+        srf = font.render(text, antialias, color)
+        self._surfs[key] = srf
+        if len(self._surfs) > self.capacity:
+            self._surfs.popitem(last=False)
+        return srf
+
+    def stats(self):
+        """
+        Returns:
+        - dict: hits, misses, current size and capacity
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._surfs), "capacity": self.capacity}
+
+    def clear(self):
+        self._surfs.clear()
+
+TEXT_CACHE = TextCache()
+
+class DigitAtlas:
+    """
+    Pre-rendered "0"-"9" and ":" glyphs composed at a fixed advance.
+
+    Each glyph is rendered once; compose() blits them into a reusable surface
+    and only re-composes when the text differs from the last call.
+    """
+    GLYPHS = "0123456789:"
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self._glyphs = {ch: font.render(ch, True, color) for ch in self.GLYPHS}
+        # Monospace the digits so the countdown does not jitter as they change.
+        self.advance = max(self._glyphs[ch].get_width() for ch in "0123456789")
+        self.colon_advance = self._glyphs[":"].get_width()
+        self.height = max(g.get_height() for g in self._glyphs.values())
+        self._text = None
+        self._surf = None
+
+    def _width(self, text):
+        return sum(self.colon_advance if ch == ":" else self.advance for ch in text)
+
+    def compose(self, text):
+        """
+        Parameters:
+        - text (str): digits and colons, e.g. "24:59"
+        Returns:
+        - pygame.Surface: composed text (shared, do not draw on it)
+        """
+        if text == self._text:
+            return self._surf
+        w = self._width(text)
+        if self._surf is None or self._surf.get_width() != w:
+            self._surf = pygame.Surface((w, self.height), pygame.SRCALPHA)
+        else:
+            self._surf.fill((0, 0, 0, 0))
+        x = 0
+        for ch in text:
+            g = self._glyphs[ch]
+            adv = self.colon_advance if ch == ":" else self.advance
+            # Glyph cells never overlap, so MAX copies source alpha onto the cleared surface.
+            self._surf.blit(g, (x + (adv - g.get_width()) // 2, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += adv
+        self._text = text
+        return self._surf
+
+def render_text(font, text, antialias, color):
+    """
+    Render text through TEXT_CACHE; same arguments as pygame.font.Font.render.
+    Returned surfaces are shared and must not be drawn on.
+    """
+    return TEXT_CACHE.render(font, text, antialias, color)
 
 # ---------------- Colors ----------------
 BG = (250, 250, 252)  # main background
+BG_BOTTOM = (230, 230, 234)  # background gradient end
 INK = (36, 38, 43)    # primary text
 MUTED = (118, 122, 128)  # secondary text
 ACCENT = (56, 120, 255)  # primary accent
@@ -52,268 +211,158 @@ RING_WORK = (64, 222, 154)
 RING_SBREAK = (255, 204, 92)
 RING_LBREAK = (255, 110, 110)
 
+DIGITS = None
+
+def init_fonts():
+    global FONT_BIG, FONT_MED, FONT_UI, FONT_TITLE, DIGITS
+    pygame.font.init()
+    with STARTUP.span("SysFont FONT_BIG"):
+        FONT_BIG = sysfont(["Inter","SF Pro Display","Segoe UI","Arial"], 112, bold=True)
+    with STARTUP.span("SysFont FONT_MED"):
+        FONT_MED = sysfont(["Inter","Segoe UI","Arial"], 20)
+    with STARTUP.span("SysFont FONT_UI"):
+        FONT_UI = sysfont(["Inter","Segoe UI","Arial"], 16)
+    with STARTUP.span("SysFont FONT_TITLE"):
+        FONT_TITLE = sysfont(["Helvetica"], 28, bold=True)
+    with STARTUP.span("digit atlas"):
+        DIGITS = DigitAtlas(FONT_BIG, INK)
+
 # ---------------- Layout ----------------
 WIDTH, HEIGHT = 1200, 720
 PADDING = 24
 GAP = 20
 CHIP_H = 38
 TITLE_H = 56
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Pomodoro Timer ⏰")
-CLOCK = pygame.time.Clock()
+SCREEN = None  # created by init_display()
+CLOCK = None
 FPS = 60
+IDLE_FPS = 1          # wakeups per second when nothing is scheduled sooner
+IDLE_AFTER = 1.0      # seconds without input before dropping to IDLE_FPS
+
+def use_headless_drivers():
+    """Select the SDL dummy video/audio drivers; must run before init_display()."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+def init_display():
+    global SCREEN, CLOCK
+    with STARTUP.span("pygame.init"):
+        pygame.init()
+    with STARTUP.span("display.set_mode"):
+        SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Pomodoro Timer ⏰")
+    CLOCK = pygame.time.Clock()
 
 # ---------------- Ring visuals ----------------
 RING_THICKNESS = 14
-RING_STEPS = 360
-
-# ---------------- Models ----------------
-@dataclass
-class Config:
-    """
-    Application configuration settings.
+RING_QUANT = 720      # progress resolution the ring is redrawn at
 
-    Attributes:
-    - focus_level (str): "Traditional" or "Custom" set of durations.
-    - pomodoro_min (int): Default pomodoro minutes for Traditional mode.
-    - short_min (int): Default short break minutes for Traditional mode.
-    - long_min (int): Default long break minutes for Traditional mode.
-    - custom_pomodoro_min (int): Custom pomodoro minutes for Custom mode.
-    - custom_short_min (int): Custom short break minutes for Custom mode.
-    - custom_long_min (int): Custom long break minutes for Custom mode.
-    - auto_start_pomodoros (bool): Auto-start focus after breaks.
-    - auto_start_breaks (bool): Auto-start breaks after focus.
-    - alarm_index (int): Index into available alarm sounds.
-    - mute (bool): True to mute alarms.
-    - long_break_every (int): After how many pomodoros to take a long break.
-    """
-    focus_level: str = "Traditional"  # "Traditional" | "Custom"
-    pomodoro_min: int = 25
-    short_min: int = 5
-    long_min: int = 15
-    custom_pomodoro_min: int = 25
-    custom_short_min: int = 5
-    custom_long_min: int = 15
-    auto_start_pomodoros: bool = False
-    auto_start_breaks: bool = False
-    alarm_index: int = 0
-    mute: bool = False
-    long_break_every: int = 4
-
-@dataclass
-class Counters:
-    """
-    Day/session counters.
-
-    Attributes:
-    - pomodoros (int): Completed pomodoro sessions.
-    - short_breaks (int): Completed short breaks.
-    - long_breaks (int): Completed long breaks.
-    """
-    pomodoros: int = 0
-    short_breaks: int = 0
-    long_breaks: int = 0
-
-# ---------------- Persistence ----------------
-def load_config() -> Config:
-    """
-    Load configuration from CONFIG_FILE.
-
-    Returns:
-    - Config: Loaded configuration, or defaults on error/missing file.
-    """
-    try:
-        if CONFIG_FILE.exists():
-            return Config(**json.loads(CONFIG_FILE.read_text(encoding="utf-8")))
-    except Exception:
-        pass
-    return Config()
-
-def save_config(cfg: Config):
-    """
-    Save configuration to CONFIG_FILE.
+# ---------------- Sounds ----------------
+def _mixer_profile(cfg: Config):
+    """pygame.mixer.init() arguments for the profile in cfg (always signed 16-bit)."""
+    return {"frequency": cfg.mixer_frequency, "size": -16,
+            "channels": cfg.mixer_channels, "buffer": cfg.mixer_buffer}
 
-    Parameters:
-    - cfg (Config): Configuration to persist.
-    """
+def init_mixer(cfg: Config = None):
     try:
-        CONFIG_FILE.write_text(json.dumps(asdict(cfg), indent=2), encoding="utf-8")
+        if cfg is None:
+            pygame.mixer.init()
+        else:
+            pygame.mixer.init(**_mixer_profile(cfg))
+        return True
     except Exception:
-        pass
+        return False
 
-def load_counters() -> Counters:
-    """
-    Load the last counters entry from COUNTERS_FILE (CSV).
+ALARM_PATHS = [SOUNDS / "argon.mp3", SOUNDS / "echime.mp3", SOUNDS / "chime.mp3"]
+ALARMS = [None, None, None]  # filled on first use by _alarm_sound()
+_mixer_ok = False
 
-    Returns:
-    - Counters: Counters from last row, or defaults if not found/failed.
-    """
-    try:
-        if COUNTERS_FILE.exists():
-            with COUNTERS_FILE.open("r", newline="", encoding="utf-8") as f:
-                r = csv.DictReader(f)
-                rows = list(r)
-                if rows:
-                    row = rows[-1]
-                    return Counters(
-                        pomodoros=int(row.get("pomodoros", 0)),
-                        short_breaks=int(row.get("short_breaks", 0)),
-                        long_breaks=int(row.get("long_breaks", 0)),
-                    )
-    except Exception:
-        pass
-    return Counters()
+def init_audio():
+    global _mixer_ok
+    with STARTUP.span("init_mixer"):
+        _mixer_ok = init_mixer(cfg)
+    if _mixer_ok:
+        _prune_alarm_cache()
 
-def save_counters(cnt: Counters):
+def _alarm_cache_path(src):
     """
-    Append counters as a row to COUNTERS_FILE.
-
-    Parameters:
-    - cnt (Counters): Counters snapshot to append.
+    Decoded-PCM WAV for an alarm, named after the source's size/mtime and the
+    mixer format so a changed file or mixer setting gets a fresh decode.
     """
-    try:
-        write_header = not COUNTERS_FILE.exists()
-        with COUNTERS_FILE.open("a", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=["pomodoros","short_breaks","long_breaks"])
-            if write_header:
-                w.writeheader()
-            w.writerow(asdict(cnt))
-    except Exception:
-        pass
+    st = src.stat()
+    freq, fmt, channels = pygame.mixer.get_init()
+    return CACHE_DIR / f"{src.stem}-{st.st_size}-{st.st_mtime_ns}-{freq}x{channels}x{abs(fmt)}.wav"
 
-def load_tasks():
+def _prune_alarm_cache():
     """
-    Load tasks model from TASKS_FILE.
-
-    Returns:
-    - dict: Model with keys "tasks" (list) and "hide_completed" (bool).
+    Delete decoded alarms that no current alarm file and mixer format would
+    use, so replaced or removed sounds do not pile up under CACHE_DIR.
     """
+    keep = set()
+    for src in ALARM_PATHS:
+        try:
+            keep.add(_alarm_cache_path(src))
+        except OSError:
+            pass
     try:
-        if TASKS_FILE.exists():
-            return json.loads(TASKS_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        pass
-    return {"tasks": [], "hide_completed": False}
+        stale = [p for p in CACHE_DIR.iterdir() if p.suffix in (".wav", ".tmp") and p not in keep]
+    except OSError:
+        return
+    for p in stale:
+        try:
+            p.unlink()
+        except OSError:
+            pass
 
-def save_tasks(model):
+def _alarm_sound(index):
     """
-    Persist tasks model to TASKS_FILE.
-
-    Parameters:
-    - model (dict): Tasks model to save.
+    Return the alarm Sound for index, decoding it on first use. The decoded
+    samples are kept as a WAV under CACHE_DIR so later runs skip MP3 decoding.
     """
+    i = index % len(ALARMS)
+    if ALARMS[i] is not None or not _mixer_ok:
+        return ALARMS[i]
+    src = ALARM_PATHS[i]
     try:
-        TASKS_FILE.write_text(json.dumps(model, indent=2), encoding="utf-8")
+        if not src.exists(): return None
+        cached = _alarm_cache_path(src)
+        if cached.exists():
+            try:
+                ALARMS[i] = pygame.mixer.Sound(str(cached))
+                return ALARMS[i]
+            except Exception:
+                pass
+        ALARMS[i] = pygame.mixer.Sound(str(src))
+        freq, fmt, channels = pygame.mixer.get_init()
+        # WAV holds signed 16-bit PCM, the mixer default; other formats are not cached.
+        if fmt == -16 and sys.byteorder == "little":
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(".tmp")
+            with wave.open(str(tmp), "wb") as w:
+                w.setnchannels(channels)
+                w.setsampwidth(2)
+                w.setframerate(freq)
+                w.writeframes(ALARMS[i].get_raw())
+            tmp.replace(cached)
+            _prune_alarm_cache()
     except Exception:
         pass
-
-def _sanitized_tasks_model(model):
-    out = {"tasks": [], "hide_completed": model.get("hide_completed", False)}
-    for t in model.get("tasks", []):
-        clean = {k: v for k, v in t.items() if not (isinstance(k, str) and k.startswith("_"))}
-        out["tasks"].append(clean)
-    return out
-
-# ---------------- Sounds ----------------
-def init_mixer():
-    try:
-        pygame.mixer.init()
-        return True
-    except Exception:
-        return False
-
-ALARM_PATHS = [SOUNDS / "argon.mp3", SOUNDS / "echime.mp3", SOUNDS / "chime.mp3"]
-ALARMS = [None, None, None]
-if init_mixer():
-    for i, p in enumerate(ALARM_PATHS):
-        try:
-            if p.exists():
-                ALARMS[i] = pygame.mixer.Sound(str(p))
-        except Exception:
-            ALARMS[i] = None
+    return ALARMS[i]
 
 def play_alarm(cfg: Config):
-    if cfg.mute: return
-    snd = ALARMS[cfg.alarm_index % len(ALARMS)]
-    if snd:
-        try: snd.play()
-        except Exception: pass
+    """Play the configured alarm; returns the Sound that started, or None."""
+    if cfg.mute: return None
+    return pre_play_alarm(cfg.alarm_index)
 
 def pre_play_alarm(alarm_index):
-    snd = ALARMS[alarm_index % len(ALARMS)]
+    snd = _alarm_sound(alarm_index)
     if snd:
-        try: snd.play()
-        except Exception: pass
-
-# ---------------- Timer engine ----------------
-class TimerEngine:
-    def __init__(self, cfg: Config):
-        self.cfg = cfg
-        self.mode = "Pomodoro"  # "Pomodoro" | "Short Break" | "Long Break"
-        self.running = False
-        self.remaining = self._mode_seconds()
-        self.cycle_done = 0
-
-    def _triplet(self):
-        if self.cfg.focus_level == "Traditional":
-            return (self.cfg.pomodoro_min, self.cfg.short_min, self.cfg.long_min)
-        return (self.cfg.custom_pomodoro_min, self.cfg.custom_short_min, self.cfg.custom_long_min)
-
-    def _mode_seconds(self):
-        p, s, l = self._triplet()
-        return (p if self.mode=="Pomodoro" else s if self.mode=="Short Break" else l) * 60
-
-    def set_mode(self, m: str):
-        self.mode = m
-        self.running = False
-        self.remaining = self._mode_seconds()
-
-    def start(self): self.running = True
-    def pause(self): self.running = False
-
-    def stop(self):
-        self.running = False
-        self.remaining = self._mode_seconds()
-
-    def skip_to_pomodoro(self):
-        self.mode = "Pomodoro"
-        self.remaining = self._mode_seconds()
-        self.running = True
-
-    def skip_to_break(self):
-        next_is_long = (self.cycle_done + 1) % self.cfg.long_break_every == 0
-        self.mode = "Long Break" if next_is_long else "Short Break"
-        self.remaining = self._mode_seconds()
-        self.running = True
-
-    def tick(self, dt_sec: float) -> bool:
-        if not self.running: return False
-        self.remaining -= dt_sec
-        if self.remaining <= 0:
-            self.remaining = 0
-            self.running = False
-            return True
-        return False
-
-    def on_complete(self, counters: Counters):
-        if self.mode == "Pomodoro":
-            counters.pomodoros += 1
-            self.cycle_done += 1
-            if self.cfg.auto_start_breaks:
-                self.skip_to_break()
-            else:
-                next_is_long = (self.cycle_done) % self.cfg.long_break_every == 0
-                self.mode = "Long Break" if next_is_long else "Short Break"
-                self.remaining = self._mode_seconds()
-        elif self.mode == "Short Break":
-            counters.short_breaks += 1
-            self.mode = "Pomodoro"; self.remaining = self._mode_seconds()
-            if self.cfg.auto_start_pomodoros: self.running = True
-        else:
-            counters.long_breaks += 1
-            self.cycle_done = 0
-            self.mode = "Pomodoro"; self.remaining = self._mode_seconds()
-            if self.cfg.auto_start_pomodoros: self.running = True
+        try:
+            snd.play()
+            return snd
+        except Exception:
+            pass
+    return None
 
 # ---------------- Rect button ----------------
 class RectButton:
@@ -333,12 +382,12 @@ class RectButton:
             r = pygame.Rect(0,0,w,h); r.center = self.rect.center
             pygame.draw.rect(surf, color, r, border_radius=10)
             pygame.draw.rect(surf, self.border, r, width=1, border_radius=10)
-            txt = self.font.render(self.label, True, self.fg)
+            txt = render_text(self.font, self.label, True, self.fg)
             surf.blit(txt, txt.get_rect(center=r.center))
         else:
             pygame.draw.rect(surf, color, self.rect, border_radius=10)
             pygame.draw.rect(surf, self.border, self.rect, width=1, border_radius=10)
-            txt = self.font.render(self.label, True, self.fg)
+            txt = render_text(self.font, self.label, True, self.fg)
             surf.blit(txt, txt.get_rect(center=self.rect.center))
 
     def hit(self, pos):
@@ -348,48 +397,181 @@ class RectButton:
 def fmt_time(sec: float):
     s = max(0, int(sec)); return f"{s//60:02d}:{s%60:02d}"
 
+class RingSprite:
+    """
+    Cached progress ring for one radius.
+
+    The track is rendered once; the progress arc lives on its own surface,
+    quantized to RING_QUANT steps and painted incrementally as progress grows,
+    so drawing the ring is two blits regardless of progress.
+    """
+    def __init__(self, radius):
+        self.radius = radius
+        size = radius * 2
+        self.track = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(self.track, RING_TRACK, (radius, radius), radius, RING_THICKNESS)
+        self.arc = pygame.Surface((size, size), pygame.SRCALPHA)
+        self._color = None
+        self._step = 0
+
+    def _paint(self, step0, step1):
+        # Fill the annulus slice [step0, step1] as one polygon; unlike thick
+        # draw.arc calls, adjacent slices then meet without seams or holes.
+        start = -math.pi/2
+        per = 2 * math.pi / RING_QUANT
+        c = self.radius
+        outer = self.radius - 0.5
+        inner = self.radius - RING_THICKNESS + 0.5
+        angles = [start + k * per for k in range(max(0, step0 - 1), step1 + 1)]
+        pts = [(c + outer * math.cos(a), c - outer * math.sin(a)) for a in angles]
+        pts += [(c + inner * math.cos(a), c - inner * math.sin(a)) for a in reversed(angles)]
+        pygame.draw.polygon(self.arc, self._color, pts)
+
+    def update(self, progress, color):
+        step = int(max(0.0, min(1.0, progress)) * RING_QUANT)
+        if color != self._color or step < self._step:
+            self.arc.fill((0, 0, 0, 0))
+            self._color = color
+            self._step = 0
+        if step > self._step:
+            self._paint(self._step, step)
+            self._step = step
+
+    def draw(self, surf, center):
+        topleft = (center[0] - self.radius, center[1] - self.radius)
+        surf.blit(self.track, topleft)
+        if self._step > 0:
+            surf.blit(self.arc, topleft)
+
+_ring_sprites = {}
+
 def draw_ring(surf, center, radius, progress, color):
-    pygame.draw.circle(surf, RING_TRACK, center, radius, RING_THICKNESS)
-    if progress <= 0:
-        return
-    rect = pygame.Rect(0,0,radius*2, radius*2); rect.center = center
-    start = -math.pi/2
-    end = start + max(0.0, min(1.0, progress)) * 2 * math.pi
-    try:
-        pygame.draw.arc(surf, color, rect, start, end, RING_THICKNESS)
-    except Exception:
-        steps = max(1, int(RING_STEPS * progress))
-        for i in range(steps):
-            a0 = start + (end - start) * (i/steps)
-            a1 = start + (end - start) * ((i+1)/steps)
-            pygame.draw.arc(surf, color, rect, a0, a1, RING_THICKNESS)
+    sprite = _ring_sprites.get(radius)
+    if sprite is None:
+        sprite = _ring_sprites[radius] = RingSprite(radius)
+    sprite.update(progress, color)
+    sprite.draw(surf, center)
 
 def ring_color(mode):
     return RING_WORK if mode=="Pomodoro" else (RING_SBREAK if mode=="Short Break" else RING_LBREAK)
 
 # ---------------- Visual helpers ----------------
+class SurfacePool:
+    """
+    Reusable scratch surfaces keyed by size, flags and an optional tag.
+
+    get() returns (surface, fresh); callers paint the surface only when fresh
+    and otherwise blit the cached contents, so per-frame overlays and shadows
+    are allocated once instead of every frame.
+    """
+    def __init__(self):
+        self._surfs = {}
+
+    def get(self, size, flags=0, tag=None):
+        key = (tuple(size), flags, tag)
+        srf = self._surfs.get(key)
+        if srf is not None:
+            return srf, False
+        srf = self._surfs[key] = pygame.Surface(size, flags)
+        return srf, True
+
+    def clear(self):
+        self._surfs.clear()
+
+SURFACES = SurfacePool()
+
 def draw_shadow(rect: pygame.Rect, offset=(4,4), radius=10, alpha=60):
     shadow = rect.inflate(12, 12).move(offset)
-    srf = pygame.Surface(shadow.size, pygame.SRCALPHA)
+    srf, _ = SURFACES.get(shadow.size, pygame.SRCALPHA, "shadow")
     SCREEN.blit(srf, shadow.topleft)
 
-def draw_background():
-    top = BG
-    bottom = (230, 230, 234)
-    for i in range(HEIGHT):
-        t = i / max(1, HEIGHT - 1)
+_bg_surf = None
+_bg_key = None
+
+def _build_background(size, top, bottom):
+    """
+    Render the vertical background gradient once into an opaque surface.
+
+    Parameters:
+    - size (tuple): (width, height) of the surface
+    - top (tuple): RGB color of the first row
+    - bottom (tuple): RGB color of the last row
+    Returns:
+    - pygame.Surface: gradient converted to the display pixel format
+    """
+    w, h = size
+    srf = pygame.Surface((w, h))
+    for i in range(h):
+        t = i / max(1, h - 1)
         col = (
             int(top[0] * (1-t) + bottom[0] * t),
             int(top[1] * (1-t) + bottom[1] * t),
             int(top[2] * (1-t) + bottom[2] * t),
         )
-        pygame.draw.line(SCREEN, col, (0, i), (WIDTH, i))
+        pygame.draw.line(srf, col, (0, i), (w, i))
+    return srf.convert()
+
+def draw_background():
+    global _bg_surf, _bg_key
+    key = (WIDTH, HEIGHT, BG, BG_BOTTOM)
+    if _bg_surf is None or _bg_key != key:
+        _bg_surf = _build_background((WIDTH, HEIGHT), BG, BG_BOTTOM)
+        _bg_key = key
+    SCREEN.blit(_bg_surf, (0, 0))
+
+# ---------------- Dirty rect compositor ----------------
+class DirtyRegions:
+    """
+    Track a state signature per screen region and report which regions changed.
+
+    Each frame the caller describes the screen as (key, rect, signature) triples.
+    A region whose signature differs from the previous frame contributes its rect
+    to the dirty list; an invalidated compositor reports the whole screen once.
+    """
+    def __init__(self):
+        self._sigs = {}
+        self._full = True
+
+    def invalidate(self):
+        self._full = True
+
+    def collect(self, regions):
+        """
+        Compare this frame's region signatures against the last frame.
+
+        Parameters:
+        - regions (list): (key, rect, signature) triples; rect may be None
+          to force a full repaint when the signature changes
+        Returns:
+        - list[pygame.Rect]: rects to repaint and upload, empty if idle
+        """
+        dirty = []
+        for key, rect, sig in regions:
+            if key in self._sigs and self._sigs[key] == sig:
+                continue
+            self._sigs[key] = sig
+            if rect is None:
+                self._full = True
+            else:
+                dirty.append(pygame.Rect(rect))
+        if self._full:
+            self._full = False
+            return [SCREEN.get_rect()]
+        return dirty
 
 # ---------------- Init runtime ----------------
-cfg = load_config()
-cnt = load_counters()
-tasks_model = load_tasks()
-engine = TimerEngine(cfg)
+# Loaded by load_runtime()
+cfg = None
+cnt = None
+tasks_model = None
+engine = None
+
+def load_runtime():
+    global cfg, cnt, tasks_model, engine
+    cfg = load_config()
+    cnt = load_counters()
+    tasks_model = load_tasks()
+    engine = TimerEngine(cfg)
 
 # Layout split
 left_w = int(WIDTH * 0.64)
@@ -397,20 +579,26 @@ right_w = WIDTH - left_w - (PADDING * 3)
 LEFT = pygame.Rect(PADDING, TITLE_H, left_w, HEIGHT - TITLE_H - PADDING)
 RIGHT = pygame.Rect(PADDING*2 + left_w, TITLE_H, right_w, HEIGHT - TITLE_H - PADDING)
 
-# Top chips and controls
-row_y = LEFT.y + 8
-chip_w = (LEFT.width - GAP*2) // 3
-chips = [
-    RectButton(pygame.Rect(LEFT.x, row_y, chip_w, CHIP_H), "Pomodoro", FONT_MED),
-    RectButton(pygame.Rect(LEFT.x + chip_w + GAP, row_y, chip_w, CHIP_H), "Short Break", FONT_MED),
-    RectButton(pygame.Rect(LEFT.x + 2*(chip_w + GAP), row_y, chip_w, CHIP_H), "Long Break", FONT_MED),
-]
-row_y2 = row_y + CHIP_H + 18
-start_btn = RectButton(pygame.Rect(0,0,260,44), "Start / Pause (Space)", FONT_MED, bg=(240,245,255))
-start_btn.rect.center = (LEFT.centerx, row_y2 + 28)
-row_y4 = start_btn.rect.bottom + 16
-stop_btn = RectButton(pygame.Rect(0,0,200,36), "Stop (reset current)", FONT_UI)
-stop_btn.rect.center = (LEFT.centerx, row_y4 + 18)
+# Top chips and controls, built by build_widgets() once fonts exist
+chips = []
+start_btn = None
+stop_btn = None
+
+def build_widgets():
+    global chips, start_btn, stop_btn
+    row_y = LEFT.y + 8
+    chip_w = (LEFT.width - GAP*2) // 3
+    chips = [
+        RectButton(pygame.Rect(LEFT.x, row_y, chip_w, CHIP_H), "Pomodoro", FONT_MED),
+        RectButton(pygame.Rect(LEFT.x + chip_w + GAP, row_y, chip_w, CHIP_H), "Short Break", FONT_MED),
+        RectButton(pygame.Rect(LEFT.x + 2*(chip_w + GAP), row_y, chip_w, CHIP_H), "Long Break", FONT_MED),
+    ]
+    row_y2 = row_y + CHIP_H + 18
+    start_btn = RectButton(pygame.Rect(0,0,260,44), "Start / Pause (Space)", FONT_MED, bg=(240,245,255))
+    start_btn.rect.center = (LEFT.centerx, row_y2 + 28)
+    row_y4 = start_btn.rect.bottom + 16
+    stop_btn = RectButton(pygame.Rect(0,0,200,36), "Stop (reset current)", FONT_UI)
+    stop_btn.rect.center = (LEFT.centerx, row_y4 + 18)
 
 # Customize dropdown states
 cust_menu_open = False
@@ -432,6 +620,7 @@ add_rect = pygame.Rect(RIGHT.x + 14, RIGHT.y + 44, RIGHT.width - 28, 38)
 adding_task = False
 new_task = ""
 caret_timer = 0.0
+CARET_BLINK = 0.5  # seconds per caret on/off phase
 caret_vis = True
 tasks_menu_open = False
 tasks_menu_rect = None
@@ -444,11 +633,16 @@ custom_subtitle = ""
 editing_title = False
 title_text = ""
 
+def _ring_geometry():
+    center = (LEFT.centerx, (stop_btn.rect.bottom + LEFT.bottom)//2 - 16)
+    ring_r = min(LEFT.width//3 + 60, (LEFT.height - (stop_btn.rect.bottom - LEFT.y))//2 - 30)
+    return center, ring_r
+
 # ---------------- Draw routines ----------------
 def draw_title_bar():
     global cust_btn_rect, reset_btn_rect
     pygame.draw.rect(SCREEN, (15,58,99), pygame.Rect(0,0,WIDTH,TITLE_H))
-    t = FONT_TITLE.render("PyModoro", True, (244,246,249))
+    t = render_text(FONT_TITLE, "PyModoro", True, (244,246,249))
     SCREEN.blit(t, (16, (TITLE_H - t.get_height())//2))
     label = "Customize"
     pill_w, pill_h = 110, 32
@@ -457,17 +651,18 @@ def draw_title_bar():
     col = ACCENT if not hovered else ACCENT_DARK
     pygame.draw.rect(SCREEN, col, cust_btn_rect, border_radius=18)
     inner = cust_btn_rect.inflate(-6, -6)
-    inner_s = pygame.Surface((inner.width, inner.height), pygame.SRCALPHA)
-    pygame.draw.rect(inner_s, (255,255,255,24), inner_s.get_rect(), border_radius=14)
+    inner_s, fresh = SURFACES.get(inner.size, pygame.SRCALPHA, "pill_inner")
+    if fresh:
+        pygame.draw.rect(inner_s, (255,255,255,24), inner_s.get_rect(), border_radius=14)
     SCREEN.blit(inner_s, inner.topleft)
-    txt = FONT_UI.render(label, True, (255,255,255))
+    txt = render_text(FONT_UI, label, True, (255,255,255))
     SCREEN.blit(txt, txt.get_rect(center=cust_btn_rect.center))
     r_w, r_h = 140, 32
     reset_btn_rect = pygame.Rect(cust_btn_rect.left - 8 - r_w, (TITLE_H - r_h)//2, r_w, r_h)
     hovered_r = reset_btn_rect.collidepoint(pygame.mouse.get_pos())
     colr = RESET_RED if not hovered_r else RESET_RED_DARK
     pygame.draw.rect(SCREEN, colr, reset_btn_rect, border_radius=16)
-    txt2 = FONT_UI.render("Reset Session", True, (255,255,255))
+    txt2 = render_text(FONT_UI, "Reset Session", True, (255,255,255))
     SCREEN.blit(txt2, txt2.get_rect(center=reset_btn_rect.center))
 
 def draw_customize_menu(mouse):
@@ -489,7 +684,7 @@ def draw_customize_menu(mouse):
     for label, key in rows:
         r = pygame.Rect(cust_menu_rect.x + 8, y_cursor, cust_menu_rect.width - 16, row_h)
         if r.collidepoint(mouse): pygame.draw.rect(SCREEN, HOVER, r, border_radius=6)
-        SCREEN.blit(FONT_UI.render(label, True, INK), (r.x + 10, r.y + 8))
+        SCREEN.blit(render_text(FONT_UI, label, True, INK), (r.x + 10, r.y + 8))
         __cust_items.append((r, key))
         y_cursor += row_h
 
@@ -503,8 +698,8 @@ def draw_reset_confirm(mouse):
     draw_shadow(rect, offset=(2,4), radius=10, alpha=60)
     pygame.draw.rect(SCREEN, (255,255,255), rect, border_radius=8)
     pygame.draw.rect(SCREEN, BORDER, rect, width=1, border_radius=8)
-    msg1 = FONT_MED.render("Reset session to defaults?", True, INK)
-    msg2 = FONT_MED.render("This will reset timers and counts.", True, INK)
+    msg1 = render_text(FONT_MED, "Reset session to defaults?", True, INK)
+    msg2 = render_text(FONT_MED, "This will reset timers and counts.", True, INK)
     SCREEN.blit(msg1, (rect.x + 16, rect.y + 18))
     SCREEN.blit(msg2, (rect.x + 16, rect.y + 48))
     btn_w, btn_h = 120, 36
@@ -513,7 +708,7 @@ def draw_reset_confirm(mouse):
     for rr, label in ((yes, "Yes"), (no, "No")):
         if rr.collidepoint(mouse): pygame.draw.rect(SCREEN, HOVER, rr, border_radius=8)
         pygame.draw.rect(SCREEN, BORDER, rr, width=1, border_radius=8)
-        SCREEN.blit(FONT_UI.render(label, True, INK), (rr.centerx - 12, rr.y + 8))
+        SCREEN.blit(render_text(FONT_UI, label, True, INK), (rr.centerx - 12, rr.y + 8))
         reset_confirm_items.append((rr, label))
 
 def draw_customize_flyout(mouse):
@@ -552,7 +747,7 @@ def draw_customize_flyout(mouse):
     for label, key in sections:
         r = pygame.Rect(cust_flyout_rect.x + 8, y_cursor, cust_flyout_rect.width - 16, 32)
         if r.collidepoint(mouse): pygame.draw.rect(SCREEN, HOVER, r, border_radius=6)
-        SCREEN.blit(FONT_UI.render(label, True, INK), (r.x + 10, r.y + 8))
+        SCREEN.blit(render_text(FONT_UI, label, True, INK), (r.x + 10, r.y + 8))
         __cust_fly_items.append((r, key))
         y_cursor += 36
 
@@ -567,8 +762,9 @@ def draw_customize_flyout(mouse):
         y2 = max(TITLE_H + 4, min(y2, HEIGHT - h2 - 8))
         cust_flyout_rect.update(x2, y2, w2, h2)
         shadow = cust_flyout_rect.inflate(12,12).move(2,4)
-        srf = pygame.Surface(shadow.size, pygame.SRCALPHA)
-        pygame.draw.rect(srf, (0,0,0,0), srf.get_rect(), border_radius=10)
+        srf, fresh = SURFACES.get(shadow.size, pygame.SRCALPHA, "shadow")
+        if fresh:
+            pygame.draw.rect(srf, (0,0,0,0), srf.get_rect(), border_radius=10)
         SCREEN.blit(srf, shadow.topleft)
         pygame.draw.rect(SCREEN, (255,255,255), cust_flyout_rect, border_radius=8)
         pygame.draw.rect(SCREEN, BORDER, cust_flyout_rect, width=1, border_radius=8)
@@ -576,34 +772,36 @@ def draw_customize_flyout(mouse):
         __cust_fly_items = []
         for label, key_short, val in labels:
             r_label = pygame.Rect(cust_flyout_rect.x + 8, y_cursor, 150, step_h)
-            SCREEN.blit(FONT_UI.render(f"{label}: {val} minutes", True, INK), (r_label.x, r_label.y + 6))
+            SCREEN.blit(render_text(FONT_UI, f"{label}: {val} minutes", True, INK), (r_label.x, r_label.y + 6))
             btn_w = 28
             r_minus = pygame.Rect(cust_flyout_rect.right - 2*btn_w - 12, y_cursor, btn_w, step_h)
             r_plus  = pygame.Rect(cust_flyout_rect.right - btn_w - 8, y_cursor, btn_w, step_h)
             for rr, sym in ((r_minus,"-"), (r_plus,"+")):
                 if rr.collidepoint(mouse): pygame.draw.rect(SCREEN, (246,248,252), rr, border_radius=6)
                 pygame.draw.rect(SCREEN, BORDER, rr, width=1, border_radius=6)
-                SCREEN.blit(FONT_UI.render(sym, True, INK), (rr.centerx - 5, rr.y + 6))
+                SCREEN.blit(render_text(FONT_UI, sym, True, INK), (rr.centerx - 5, rr.y + 6))
             __cust_fly_items.append((r_minus, f"dec_{key_short}"))
             __cust_fly_items.append((r_plus,  f"inc_{key_short}"))
             y_cursor += step_h
 
+def _ring_progress():
+    total = engine._mode_seconds()
+    done = total - engine.remaining
+    return max(0.0, min(1.0, done / total if total else 0.0))
+
 def draw_left(mouse, dt):
     for b in chips:
         is_active = (engine.mode == b.label)
         b.draw(SCREEN, b.hit(mouse) or is_active, dt)
     start_btn.draw(SCREEN, start_btn.hit(mouse), dt)
     stop_btn.draw(SCREEN, stop_btn.hit(mouse), dt)
-    center = (LEFT.centerx, (stop_btn.rect.bottom + LEFT.bottom)//2 - 16)
-    total = engine._mode_seconds()
-    done = total - engine.remaining
-    progress = max(0.0, min(1.0, done / total if total else 0.0))
-    ring_r = min(LEFT.width//3 + 60, (LEFT.height - (stop_btn.rect.bottom - LEFT.y))//2 - 30)
+    center, ring_r = _ring_geometry()
+    progress = _ring_progress()
     draw_ring(SCREEN, center, ring_r, progress, ring_color(engine.mode))
-    digits = FONT_BIG.render(fmt_time(engine.remaining), True, INK)
+    digits = DIGITS.compose(fmt_time(engine.remaining))
     SCREEN.blit(digits, digits.get_rect(center=center))
     sub = title_text if editing_title else (custom_subtitle.strip() or engine.mode)
-    sub_surf = FONT_MED.render(sub, True, MUTED)
+    sub_surf = render_text(FONT_MED, sub, True, MUTED)
     sub_y = center[1] + int(ring_r * 0.55)
     SCREEN.blit(sub_surf, sub_surf.get_rect(center=(center[0], sub_y)))
     return pygame.Rect(center[0]-280//2, center[1] + ring_r - 34, 280, 28)
@@ -611,7 +809,7 @@ def draw_left(mouse, dt):
 def draw_right(mouse, dt):
     pygame.draw.rect(SCREEN, CARD, RIGHT, border_radius=12)
     pygame.draw.rect(SCREEN, BORDER, RIGHT, width=1, border_radius=12)
-    hdr = FONT_TITLE.render("To-do Tasks", True, INK)
+    hdr = render_text(FONT_TITLE, "To-do Tasks", True, INK)
     SCREEN.blit(hdr, (RIGHT.x + 14, RIGHT.y + 8))
     global dots_rect, tasks_menu_rect
     dots_rect = pygame.Rect(RIGHT.right - 34, RIGHT.y + 10, 24, 24)
@@ -633,22 +831,18 @@ def draw_right(mouse, dt):
         for idx, (label, key) in enumerate(items):
             r = pygame.Rect(tasks_menu_rect.x + 12, tasks_menu_rect.y + 12 + idx*38, tasks_menu_rect.width - 24, 34)
             if r.collidepoint(mouse): pygame.draw.rect(SCREEN, HOVER, r, border_radius=6)
-            SCREEN.blit(FONT_UI.render(label, True, INK), (r.x + 8, r.y + 8))
+            SCREEN.blit(render_text(FONT_UI, label, True, INK), (r.x + 8, r.y + 8))
             tasks_menu_items.append((r, key))
     else:
         tasks_menu_rect = None
     pygame.draw.rect(SCREEN, (255,255,255), add_rect, border_radius=8)
     pygame.draw.rect(SCREEN, BORDER, add_rect, width=1, border_radius=8)
-    global caret_timer, caret_vis
     if not adding_task:
-        ph = FONT_UI.render("+ Add a task (Enter to save)", True, MUTED)
+        ph = render_text(FONT_UI, "+ Add a task (Enter to save)", True, MUTED)
         SCREEN.blit(ph, ph.get_rect(midleft=(add_rect.x + 12, add_rect.centery)))
     else:
-        txt = FONT_UI.render(new_task, True, INK)
+        txt = render_text(FONT_UI, new_task, True, INK)
         SCREEN.blit(txt, txt.get_rect(midleft=(add_rect.x + 12, add_rect.centery)))
-        caret_timer += dt
-        if caret_timer >= 0.5:
-            caret_timer = 0.0; caret_vis = not caret_vis
         if caret_vis:
             cx = min(add_rect.right-12, add_rect.x + 12 + txt.get_width() + 2)
             pygame.draw.line(SCREEN, INK, (cx, add_rect.y+8), (cx, add_rect.bottom-8), 2)
@@ -665,7 +859,7 @@ def draw_right(mouse, dt):
             pygame.draw.line(SCREEN, (60, 160, 90), (cb.left + 3, cb.centery), (cb.centerx, cb.bottom - 4), 3)
             pygame.draw.line(SCREEN, (60, 160, 90), (cb.centerx, cb.bottom - 4), (cb.right - 3, cb.top + 4), 3)
         color = (150,150,150) if t.get("done") else INK
-        txt = FONT_UI.render(t.get("title",""), True, color)
+        txt = render_text(FONT_UI, t.get("title",""), True, color)
         SCREEN.blit(txt, (cb.right + 8, row.y + (row_h - txt.get_height())//2))
         if t.get("done"):
             y_mid = row.y + row_h//2
@@ -673,25 +867,38 @@ def draw_right(mouse, dt):
         ui_task_rows.append((row, cb, idx))
         y += row_h + 6
 
+def _tick_caret(dt):
+    global caret_timer, caret_vis
+    if not adding_task: return
+    caret_timer += dt
+    if caret_timer >= CARET_BLINK:
+        caret_timer = 0.0; caret_vis = not caret_vis
+
 # ---------------- Minimal music popup ----------------
 SONGS = ASSETS / "songs"
 _AUDIO_EXTS = {".mp3", ".ogg", ".wav"}
+TRACKS = TrackCache(TRACK_CACHE_FILE)
 
-def _scan_songs_simple():
+def _scan_songs():
+    """Yield audio files under SONGS (recursively) as they are found."""
     try:
         if SONGS.exists():
-            return [p for p in sorted(SONGS.iterdir()) if p.is_file() and p.suffix.lower() in _AUDIO_EXTS]
+            yield from TRACKS.walk(SONGS, _AUDIO_EXTS)
     except Exception:
         pass
-    return []
 
-_playlist = _scan_songs_simple()
+_playlist = []
+_playlist_known = set()  # paths in _playlist, so rescans and watch events never add duplicates
 _music_idx = 0
 _music_playing = False
-_music_started_ms = 0
-_music_elapsed_pause = 0.0
 _music_volume = 0.8
+_music_gain = 1.0  # envelope factor applied on top of _music_volume
 _music_total_guess = 0.0
+_music_loaded = None      # (index, path, data, duration) currently in the mixer
+_music_pending = None     # playlist index waiting on LOADER
+_music_prefetched = None  # next track already read by LOADER
+_music_want_play = False  # start playback as soon as the pending track is ready
+_music_queued = None      # next track handed to pygame.mixer.music.queue
 
 music_popup_open = False
 _music_btn = None
@@ -701,52 +908,495 @@ _music_next_rect = None
 _music_seek_rect = None
 _music_vol_rect = None
 
-def _music_guess_length(path):
+def _probe_or_decode(path):
+    length = probe_duration(path)
+    if length > 0:
+        return length
+    # Headers unreadable: fall back to decoding the whole track.
     try:
         snd = pygame.mixer.Sound(str(path))
         return float(snd.get_length())
     except Exception:
         return 0.0
 
+def _music_guess_length(path):
+    length = TRACKS.duration(path, probe=_probe_or_decode)
+    TRACKS.save()
+    return length
+
+# ---------------- Playlist scanning ----------------
+PLAYLIST_GROWN = pygame.event.custom_type()
+SCAN_BATCH = 256  # tracks moved into _playlist per frame at most
+
+class PlaylistScanner:
+    """
+    Background thread that walks SONGS and hands each track found to the main
+    loop through the `found` queue; `done` is set once the walk finishes.
+    """
+    def __init__(self):
+        self.found = queue.Queue()
+        self.done = False
+        self._thread = None
+
+    def start(self):
+        self.done = False
+        self._thread = threading.Thread(target=self._run, name="playlist-scan", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        n = 0
+        try:
+            for path in _scan_songs():
+                self.found.put(path)
+                n += 1
+                if n == 1 or n % SCAN_BATCH == 0:
+                    self._wake()
+        finally:
+            TRACKS.save()
+            self.done = True
+            self._wake()
+
+    def _wake(self):
+        try:
+            pygame.event.post(pygame.event.Event(PLAYLIST_GROWN))
+        except Exception:
+            pass
+
+SCANNER = PlaylistScanner()
+
+def _playlist_add(path):
+    """
+    Append a discovered track. In shuffle mode this is one step of an
+    inside-out Fisher-Yates shuffle over the not-yet-reached part of the
+    playlist, so the order stays uniformly random without collecting all
+    tracks first. The current and prefetched next track never move.
+    """
+    if path in _playlist_known: return
+    _playlist_known.add(path)
+    _playlist.append(path)
+    if not cfg.music_shuffle: return
+    n = len(_playlist) - 1
+    lo = _music_idx + 2 if _music_loaded or _music_pending is not None else 0
+    if lo < n:
+        j = random.randint(lo, n)
+        _playlist[j], _playlist[n] = _playlist[n], _playlist[j]
+
+def _playlist_remove(path):
+    """
+    Drop a deleted track, or every track under a deleted folder, keeping the
+    current, prefetched and queued items pointing at the right indices.
+    """
+    global _music_idx, _music_loaded, _music_prefetched, _music_queued, _music_pending
+    keep = [p for p in _playlist if p != path and path not in p.parents]
+    if len(keep) == len(_playlist): return
+    old_idx = _music_idx
+    current = _playlist[old_idx]
+    removed_before = sum(1 for p in _playlist[:old_idx] if p == path or path in p.parents)
+    pending = _music_pending is not None
+    _playlist[:] = keep
+    _playlist_known.intersection_update(keep)
+    where = {p: i for i, p in enumerate(_playlist)}
+
+    def moved(item):
+        if item is None or item[1] not in where: return None
+        return (where[item[1]],) + tuple(item[1:])
+
+    if current in where:
+        _music_idx = where[current]
+    elif not _playlist:
+        _music_idx = 0
+    elif pending:
+        # Nothing was playing yet: load the track that took its slot.
+        _music_idx = (old_idx - removed_before) % len(_playlist)
+    else:
+        # A removed current track keeps playing; point at the slot before it
+        # so the track that followed it is still next.
+        _music_idx = (old_idx - removed_before - 1) % len(_playlist)
+    queued_gone = _music_queued is not None and _music_queued[1] not in where
+    _music_loaded = moved(_music_loaded) or _music_loaded
+    _music_prefetched = moved(_music_prefetched)
+    _music_queued = moved(_music_queued)
+    if queued_gone:
+        _music_drop_queue()
+    if pending and _playlist:
+        # The loader's answer carries the old index and would be dropped; ask again.
+        _music_pending = None
+        _music_set(_music_idx)
+    _music_prefetch_next()
+
+def _music_poll_scanner():
+    """Move newly scanned tracks into _playlist; start the first one as soon as it exists."""
+    added = 0
+    while added < SCAN_BATCH:
+        try:
+            path = SCANNER.found.get_nowait()
+        except queue.Empty:
+            break
+        _playlist_add(path)
+        added += 1
+    if not added: return
+    if _music_loaded is None and _music_pending is None:
+        _music_set(0)
+    else:
+        _music_prefetch_next()
+
+# ---------------- Live asset reload ----------------
+ASSETS_CHANGED = pygame.event.custom_type()
+_asset_changes = queue.Queue()  # (kind, path) from the watcher thread
+
+def _on_asset_change(kind, path):
+    _asset_changes.put((kind, path))
+    try:
+        pygame.event.post(pygame.event.Event(ASSETS_CHANGED))
+    except Exception:
+        pass
+
+ASSET_WATCH = FolderWatcher([SONGS, SOUNDS], _AUDIO_EXTS, _on_asset_change)
+
+def _poll_asset_changes():
+    """
+    Apply files added to or removed from assets/songs and assets/sounds.
+    New songs go through the scanner queue so they land in _playlist like
+    scanned ones; a changed alarm file drops its decoded Sound so the next
+    alarm loads the new one.
+    """
+    while True:
+        try:
+            kind, path = _asset_changes.get_nowait()
+        except queue.Empty:
+            return
+        if path == SONGS or SONGS in path.parents:
+            if kind == "added":
+                SCANNER.found.put(path)
+            else:
+                _playlist_remove(path)
+        for i, src in enumerate(ALARM_PATHS):
+            if src == path or path in src.parents:
+                ALARMS[i] = None
+
+# ---------------- Alarm fade / duck envelope ----------------
+MUSIC_ENVELOPE = pygame.event.custom_type()  # one-shot timer: next envelope update
+ENVELOPE_STEP = 0.05  # seconds between volume updates, only while ramping
+RESTORE_S = 1.5       # ramp back to full volume after the alarm
+ENVELOPE = VolumeEnvelope()
+_envelope_sig = None
+_duck_span = None     # (start, end) of the last alarm, while it still shapes the curve
+
+def _envelope_apply(now):
+    """Set the music volume for `now` and arm MUSIC_ENVELOPE for the next change."""
+    global _music_gain
+    _music_gain = ENVELOPE.gain_at(now)
+    try:
+        pygame.mixer.music.set_volume(_music_volume * _music_gain)
+    except Exception:
+        pass
+    nxt = ENVELOPE.next_change(now, ENVELOPE_STEP)
+    pygame.time.set_timer(MUSIC_ENVELOPE, 0 if nxt is None else max(1, int((nxt - now) * 1000)), loops=1)
+
+def _envelope_plan(now):
+    """
+    Rebuild the envelope: hold the alarm duck and ramp back up afterwards,
+    then fade towards the duck level over the last alarm_fade_s seconds of a
+    running session so the alarm lands on quiet music.
+    """
+    global _duck_span
+    duck = max(0.0, min(1.0, cfg.alarm_duck))
+    pts = []
+    if _duck_span is not None:
+        start, end = _duck_span
+        if now < end + RESTORE_S:
+            pts += [(start, duck), (end, duck), (end + RESTORE_S, 1.0)]
+        else:
+            _duck_span = None
+    fade = cfg.alarm_fade_s
+    if engine.running and fade > 0:
+        end = engine.deadline
+        if not pts or end - fade >= pts[-1][0]:
+            pts += [(end - fade, 1.0), (end, duck)]
+    if not pts and _music_gain != 1.0:
+        # Paused or stopped mid-fade: come back up instead of jumping.
+        pts = [(now, _music_gain), (now + RESTORE_S * (1.0 - _music_gain), 1.0)]
+    ENVELOPE.set(pts)
+    _envelope_apply(now)
+
+def _envelope_sync(now):
+    """Replan when the session starts, stops, switches mode or its end moves."""
+    global _envelope_sig
+    sig = (engine.running, engine.mode, engine.deadline)
+    if sig != _envelope_sig:
+        _envelope_sig = sig
+        _envelope_plan(now)
+
+def _music_duck(snd, now=None):
+    """Hold the music at alarm_duck while snd plays, then ramp it back."""
+    global _duck_span
+    if snd is None: return
+    now = monotonic() if now is None else now
+    _duck_span = (now, now + snd.get_length())
+    _envelope_plan(now)
+
+# ---------------- Playback clock ----------------
+class PlaybackClock:
+    """
+    Position of pygame.mixer.music in the current track.
+
+    get_pos() counts the audio actually mixed since the last play() and stops
+    while paused, so offset + get_pos() stays exact across pauses and seeks
+    where wall-clock deltas drift. Readings never go backwards.
+    """
+    def __init__(self):
+        self.offset = 0.0
+        self._last = 0.0
+
+    def restart(self, offset=0.0):
+        """Call right after play()/play(start=offset) or a track change."""
+        self.offset = offset
+        self._last = offset
+
+    def position(self, total=0.0):
+        """
+        Parameters:
+        - total (float): track length to clamp to, 0.0 if unknown
+        Returns:
+        - float: seconds into the current track
+        """
+        try:
+            ms = pygame.mixer.music.get_pos()
+        except Exception:
+            ms = -1
+        if ms >= 0:
+            self._last = max(self._last, self.offset + ms / 1000.0)
+        return min(self._last, total) if total > 0 else self._last
+
+MUSIC_CLOCK = PlaybackClock()
+
+# ---------------- Background track loading ----------------
+MUSIC_READY = pygame.event.custom_type()
+MUSIC_END = pygame.event.custom_type()   # mixer end event, replaces polling get_busy()
+MUSIC_FADE = pygame.event.custom_type()  # one-shot timer: start the crossfade out
+PREFETCH_MAX_BYTES = 64 * 1024 * 1024  # larger files are streamed from disk instead
+
+class AudioLoader:
+    """
+    Worker thread that reads and probes tracks so the UI thread never blocks on disk.
+
+    request() queues (index, path); results land in `ready` as
+    (index, path, data, duration), where data is the file's bytes or None for
+    files over PREFETCH_MAX_BYTES. A MUSIC_READY event wakes the main loop.
+    """
+    def __init__(self):
+        self.ready = queue.Queue()
+        self._requests = queue.Queue()
+        self._thread = None
+
+    def request(self, index, path):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audio-loader", daemon=True)
+            self._thread.start()
+        self._requests.put((index, path))
+
+    def _run(self):
+        while True:
+            index, path = self._requests.get()
+            data = None
+            try:
+                if path.stat().st_size <= PREFETCH_MAX_BYTES:
+                    data = path.read_bytes()
+            except OSError:
+                pass
+            duration = _music_guess_length(path)
+            self.ready.put((index, path, data, duration))
+            try:
+                pygame.event.post(pygame.event.Event(MUSIC_READY))
+            except Exception:
+                pass
+
+LOADER = AudioLoader()
+
+def _music_source(item):
+    index, path, data, duration = item
+    if data is not None:
+        return (io.BytesIO(data), path.suffix[1:].lower())
+    return (str(path),)
+
+def _music_apply(item):
+    global _music_loaded, _music_playing, _music_total_guess
+    global _music_want_play, _music_queued
+    index, path, data, duration = item
+    try:
+        # load() drops anything queued behind the previous track.
+        pygame.mixer.music.load(*_music_source(item))
+        _music_queued = None
+        pygame.mixer.music.set_volume(_music_volume * _music_gain)
+        _music_total_guess = duration
+        MUSIC_CLOCK.restart()
+        _music_playing = False
+        _music_loaded = item
+    except Exception:
+        return
+    if _music_want_play:
+        _music_want_play = False
+        _music_play()
+    _music_prefetch_next()
+
+def _music_prefetch_next():
+    if len(_playlist) < 2: return
+    nxt = (_music_idx + 1) % len(_playlist)
+    if _music_prefetched and _music_prefetched[0] == nxt and _music_prefetched[1] == _playlist[nxt]:
+        return
+    LOADER.request(nxt, _playlist[nxt])
+
+def _music_poll_loader():
+    """Apply tracks the loader finished since the last frame."""
+    global _music_pending, _music_prefetched
+    while True:
+        try:
+            item = LOADER.ready.get_nowait()
+        except queue.Empty:
+            return
+        index, path = item[0], item[1]
+        if index >= len(_playlist) or _playlist[index] != path:
+            continue
+        if index == _music_pending:
+            _music_pending = None
+            _music_apply(item)
+        elif _playlist and index == (_music_idx + 1) % len(_playlist):
+            _music_prefetched = item
+            _music_queue_next()
+
+def _music_queue_next():
+    """
+    Hand the prefetched next track to the mixer so it starts the instant the
+    current one ends. Skipped when crossfading, which restarts playback itself.
+    """
+    global _music_queued
+    item = _music_prefetched
+    if not _music_playing or item is None or _music_queued is item or cfg.music_crossfade_ms > 0:
+        return
+    if item[0] != (_music_idx + 1) % len(_playlist):
+        return
+    try:
+        pygame.mixer.music.queue(*_music_source(item))
+        _music_queued = item
+    except Exception:
+        _music_queued = None
+
+def _music_drop_queue():
+    """
+    Take a removed track back out of the mixer's queue. pygame cannot unqueue,
+    so the current track is reloaded at its position; if that fails too (its
+    file went with the folder), playback moves on to the next track.
+    """
+    global _music_queued
+    _music_queued = None
+    if _music_loaded is None: return
+    pos = _music_elapsed()
+    try:
+        pygame.mixer.music.load(*_music_source(_music_loaded))
+        pygame.mixer.music.play(start=pos)
+        if not _music_playing:
+            pygame.mixer.music.pause()
+        pygame.mixer.music.set_volume(_music_volume * _music_gain)
+        MUSIC_CLOCK.restart(pos)
+    except Exception:
+        if not _playlist: return
+        playing = _music_playing
+        _music_set((_music_idx + 1) % len(_playlist))
+        if playing:
+            _music_play()
+
+def _music_schedule_fade():
+    """Arm MUSIC_FADE to fire crossfade ms before the current track ends."""
+    fade = cfg.music_crossfade_ms
+    pygame.time.set_timer(MUSIC_FADE, 0)
+    if fade <= 0 or not _music_playing or _music_total_guess <= 0:
+        return
+    left_ms = int((_music_total_guess - _music_elapsed()) * 1000) - fade
+    pygame.time.set_timer(MUSIC_FADE, max(1, left_ms), loops=1)
+
+def _music_on_fade():
+    if _music_playing:
+        try:
+            pygame.mixer.music.fadeout(cfg.music_crossfade_ms)
+        except Exception:
+            pass
+
+def _music_on_end():
+    """
+    Handle the mixer's end event: adopt the queued track that is already
+    playing, or advance to the next track if playback stopped.
+    """
+    global _music_idx, _music_loaded, _music_prefetched, _music_queued
+    global _music_playing, _music_total_guess
+    if not _playlist: return
+    busy = pygame.mixer.music.get_busy()
+    if _music_queued is not None and busy:
+        item = _music_queued
+        _music_queued = None
+        _music_prefetched = None
+        _music_idx, _music_loaded = item[0], item
+        _music_total_guess = item[3]
+        MUSIC_CLOCK.restart()
+        _music_playing = True
+        _music_prefetch_next()
+    elif _music_playing and not busy:
+        _music_next()
+
 def _music_set(i):
-    global _music_idx, _music_started_ms, _music_elapsed_pause, _music_playing, _music_total_guess
+    global _music_idx, _music_playing, _music_pending, _music_queued
     if not _playlist: return
     _music_idx = max(0, min(i, len(_playlist)-1))
+    path = _playlist[_music_idx]
+    for item in (_music_loaded, _music_prefetched):
+        if item and item[0] == _music_idx and item[1] == path:
+            _music_pending = None
+            _music_apply(item)
+            return
     try:
-        pygame.mixer.music.load(str(_playlist[_music_idx]))
-        pygame.mixer.music.set_volume(_music_volume)
-        _music_total_guess = _music_guess_length(_playlist[_music_idx])
-        _music_started_ms = pygame.time.get_ticks()
-        _music_elapsed_pause = 0.0
-        _music_playing = False
+        pygame.mixer.music.stop()
     except Exception:
         pass
+    _music_queued = None
+    MUSIC_CLOCK.restart()
+    _music_playing = False
+    _music_pending = _music_idx
+    LOADER.request(_music_idx, path)
 
 def _music_play():
-    global _music_playing, _music_started_ms
+    global _music_playing, _music_want_play
     if not _playlist: return
+    if _music_pending is not None:
+        _music_want_play = True
+        return
     try:
         if not pygame.mixer.music.get_busy():
-            pygame.mixer.music.play()
-            pygame.mixer.music.set_volume(_music_volume)
-            _music_started_ms = pygame.time.get_ticks()
+            pygame.mixer.music.play(fade_ms=max(0, cfg.music_crossfade_ms))
+            pygame.mixer.music.set_volume(_music_volume * _music_gain)
+            MUSIC_CLOCK.restart()
         else:
             pygame.mixer.music.unpause()
         _music_playing = True
     except Exception:
-        pass
+        return
+    _music_queue_next()
+    _music_schedule_fade()
 
 def _music_pause():
-    global _music_playing, _music_elapsed_pause
+    global _music_playing, _music_want_play
+    _music_want_play = False
     try:
         pygame.mixer.music.pause()
-        _music_elapsed_pause = (pygame.time.get_ticks() - _music_started_ms) / 1000.0
         _music_playing = False
     except Exception:
         pass
+    pygame.time.set_timer(MUSIC_FADE, 0)
 
 def _music_toggle():
+    global _music_want_play
     if not _playlist: return
+    if _music_want_play:
+        _music_want_play = False
+        return
     if pygame.mixer.music.get_busy() and _music_playing:
         _music_pause()
     else:
@@ -760,28 +1410,26 @@ def _music_next():
     _music_play()
 
 def _music_elapsed():
-    if _music_playing:
-        return _music_elapsed_pause + (pygame.time.get_ticks() - _music_started_ms)/1000.0
-    return _music_elapsed_pause
+    return MUSIC_CLOCK.position(_music_total_guess)
 
 def _music_seek_to(progress_01):
-    if not _playlist: return
-    total = _music_total_guess if _music_total_guess > 0 else 30.0
-    pos = max(0.0, min(1.0, progress_01)) * total
+    global _music_playing
+    # Without a known length a click on the bar has no meaningful position.
+    if not _playlist or _music_pending is not None or _music_total_guess <= 0: return
+    pos = max(0.0, min(1.0, progress_01)) * _music_total_guess
     try:
         pygame.mixer.music.play(loops=0, start=pos)
-        global _music_started_ms, _music_elapsed_pause, _music_playing
-        _music_started_ms = pygame.time.get_ticks()
-        _music_elapsed_pause = pos
+        MUSIC_CLOCK.restart(pos)
         _music_playing = True
     except Exception:
-        pass
+        return
+    _music_schedule_fade()
 
 def _music_set_volume(v):
     global _music_volume
     _music_volume = max(0.0, min(1.0, v))
     try:
-        pygame.mixer.music.set_volume(_music_volume)
+        pygame.mixer.music.set_volume(_music_volume * _music_gain)
     except Exception:
         pass
 
@@ -798,7 +1446,7 @@ def _draw_music_toggle():
     pygame.draw.rect(SCREEN, (242,245,248) if not hovered else (235,240,246), _music_btn, border_radius=8)
     pygame.draw.rect(SCREEN, BORDER, _music_btn, 1, border_radius=8)
     lbl = "Music" if not music_popup_open else "Close"
-    t = FONT_UI.render(lbl, True, INK)
+    t = render_text(FONT_UI, lbl, True, INK)
     SCREEN.blit(t, t.get_rect(center=_music_btn.center))
 
 def _draw_music_popup():
@@ -810,16 +1458,17 @@ def _draw_music_popup():
         _music_seek_rect = None
         _music_vol_rect = None
         return
-    ov = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    ov.fill((10,12,16,140))
+    ov, fresh = SURFACES.get((WIDTH, HEIGHT), pygame.SRCALPHA, "music_overlay")
+    if fresh:
+        ov.fill((10,12,16,140))
     SCREEN.blit(ov, (0,0))
     w, h = 520, 200
     _music_panel = pygame.Rect((WIDTH - w)//2, (HEIGHT - h)//2, w, h)
     pygame.draw.rect(SCREEN, (255,255,255), _music_panel, border_radius=12)
     pygame.draw.rect(SCREEN, BORDER, _music_panel, 1, border_radius=12)
-    SCREEN.blit(FONT_MED.render("Music", True, INK), (_music_panel.x + 16, _music_panel.y + 14))
-    track = "(No songs)" if not _playlist else _playlist[_music_idx].stem
-    SCREEN.blit(FONT_MED.render(track, True, INK if _playlist else MUTED), (_music_panel.x + 16, _music_panel.y + 48))
+    SCREEN.blit(render_text(FONT_MED, "Music", True, INK), (_music_panel.x + 16, _music_panel.y + 14))
+    track = ("(No songs)" if SCANNER.done else "(Scanning...)") if not _playlist else _playlist[_music_idx].stem
+    SCREEN.blit(render_text(FONT_MED, track, True, INK if _playlist else MUTED), (_music_panel.x + 16, _music_panel.y + 48))
     y = _music_panel.y + 88
     _music_play_rect = pygame.Rect(_music_panel.x + 16, y, 100, 36)
     _music_next_rect = pygame.Rect(_music_play_rect.right + 10, y, 100, 36)
@@ -827,7 +1476,7 @@ def _draw_music_popup():
         hovered = rr.collidepoint(pygame.mouse.get_pos())
         pygame.draw.rect(SCREEN, (242,245,248) if not hovered else (235,240,246), rr, border_radius=8)
         pygame.draw.rect(SCREEN, BORDER, rr, 1, border_radius=8)
-        t = FONT_UI.render(label, True, INK)
+        t = render_text(FONT_UI, label, True, INK)
         SCREEN.blit(t, t.get_rect(center=rr.center))
     _music_seek_rect = pygame.Rect(_music_next_rect.right + 24, y + 14, _music_panel.right - 24 - (_music_next_rect.right + 24), 8)
     pygame.draw.rect(SCREEN, (234,238,242), _music_seek_rect, border_radius=4)
@@ -836,19 +1485,53 @@ def _draw_music_popup():
     prog = max(0.0, min(1.0, elapsed / total))
     fill = pygame.Rect(_music_seek_rect.x, _music_seek_rect.y, int(_music_seek_rect.width * prog), _music_seek_rect.height)
     pygame.draw.rect(SCREEN, ACCENT, fill, border_radius=4)
-    tl = FONT_UI.render(_fmt_mmss(elapsed), True, MUTED)
-    tr = FONT_UI.render(_fmt_mmss(total), True, MUTED)
+    tl = render_text(FONT_UI, _fmt_mmss(elapsed), True, MUTED)
+    tr = render_text(FONT_UI, _fmt_mmss(total), True, MUTED)
     SCREEN.blit(tl, (_music_seek_rect.x, _music_seek_rect.y - tl.get_height() - 4))
     SCREEN.blit(tr, (_music_seek_rect.right - tr.get_width(), _music_seek_rect.y - tr.get_height() - 4))
     vy = _music_panel.bottom - 36
-    SCREEN.blit(FONT_UI.render("Vol", True, MUTED), (_music_panel.x + 16, vy - 8))
+    SCREEN.blit(render_text(FONT_UI, "Vol", True, MUTED), (_music_panel.x + 16, vy - 8))
     _music_vol_rect = pygame.Rect(_music_panel.x + 52, vy, _music_panel.width - 68, 6)
     pygame.draw.rect(SCREEN, (234,238,242), _music_vol_rect, border_radius=3)
     kx = _music_vol_rect.x + int(_music_volume * _music_vol_rect.width)
     pygame.draw.circle(SCREEN, ACCENT, (kx, _music_vol_rect.centery), 7)
 
-if _playlist:
-    _music_set(0)
+def init_music():
+    try:
+        pygame.mixer.music.set_endevent(MUSIC_END)
+    except Exception:
+        pass
+    # Tracks arrive through _music_poll_scanner; the first one found is loaded right away.
+    with STARTUP.span("start playlist scan"):
+        SCANNER.start()
+    with STARTUP.span("start asset watcher"):
+        ASSET_WATCH.start()
+
+# ---------------- GUI startup ----------------
+_gui_ready = False
+
+def init_gui():
+    """
+    Bring up display, fonts, widgets, audio, saved state and the music library.
+    Safe to call more than once; only the first call does any work.
+    """
+    global _gui_ready
+    if _gui_ready: return
+    with STARTUP.span("load_runtime"):
+        load_runtime()
+    # pygame.init() opens the mixer as well, so give it the configured profile first.
+    pygame.mixer.pre_init(**_mixer_profile(cfg))
+    with STARTUP.span("init_display"):
+        init_display()
+    with STARTUP.span("init_fonts"):
+        init_fonts()
+    with STARTUP.span("build_widgets"):
+        build_widgets()
+    with STARTUP.span("init_audio"):
+        init_audio()
+    with STARTUP.span("init_music"):
+        init_music()
+    _gui_ready = True
 
 # ---------------- Input handlers ----------------
 def handle_mouse(pos):
@@ -907,11 +1590,11 @@ def handle_mouse(pos):
                 elif key == "auto_break":
                     cfg.auto_start_breaks = not cfg.auto_start_breaks; save_config(cfg)
                 elif key == "alarm_1":
-                    pre_play_alarm(0); cfg.alarm_index = 0; save_config(cfg)
+                    _music_duck(pre_play_alarm(0)); cfg.alarm_index = 0; save_config(cfg)
                 elif key == "alarm_2":
-                    pre_play_alarm(1); cfg.alarm_index = 1; save_config(cfg)
+                    _music_duck(pre_play_alarm(1)); cfg.alarm_index = 1; save_config(cfg)
                 elif key == "alarm_3":
-                    pre_play_alarm(2); cfg.alarm_index = 2; save_config(cfg)
+                    _music_duck(pre_play_alarm(2)); cfg.alarm_index = 2; save_config(cfg)
                 elif key == "mute_toggle":
                     cfg.mute = not cfg.mute; save_config(cfg)
                 elif key == "skip_break":
@@ -956,8 +1639,7 @@ def handle_mouse(pos):
         stop_btn.press_anim = 1.0
         engine.stop()
 
-    center = (LEFT.centerx, (stop_btn.rect.bottom + LEFT.bottom)//2 - 16)
-    ring_r = min(LEFT.width//3 + 60, (LEFT.height - (stop_btn.rect.bottom - LEFT.y))//2 - 30)
+    center, ring_r = _ring_geometry()
     sub_rect = pygame.Rect(center[0]-280//2, center[1] + ring_r - 34, 280, 28)
     if sub_rect.collidepoint(pos):
         global editing_title, title_text
@@ -1076,52 +1758,396 @@ def _do_reset_session():
     engine.remaining = engine._mode_seconds()
     custom_subtitle = ""
 
-# ---------------- Main loop ----------------
-last = time()
-if _playlist:
-    _music_set(0)
-
-while True:
-    now = time(); dt = now - last; last = now
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            save_counters(cnt)
-            pygame.quit(); sys.exit()
-        elif event.type == pygame.KEYDOWN:
-            handle_keydown(event)
-        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            handle_mouse(event.pos)
-
-    if engine.tick(dt):
-        play_alarm(cfg)
-        engine.on_complete(cnt)
-        save_counters(cnt)
-
-    if _playlist and _music_playing and not pygame.mixer.music.get_busy():
-        _music_next()
+# ---------------- Frame composition ----------------
+compositor = DirtyRegions()
+
+def _hover_index(items, mouse):
+    for i, item in enumerate(items):
+        if item[0].collidepoint(mouse):
+            return i
+    return -1
 
-    draw_background()
-    draw_title_bar()
+def _footer_rect():
+    h = FONT_UI.get_height()
+    return pygame.Rect(LEFT.x, HEIGHT - h - 8 - 28 - 2, LEFT.width, h + 4)
+
+def _frame_regions(mouse):
+    """
+    Describe the screen as (key, rect, signature) triples for the compositor.
 
+    Parameters:
+    - mouse (tuple): current mouse position
+    Returns:
+    - list: regions whose signature change marks their rect dirty
+    """
+    buttons = chips + [start_btn, stop_btn]
+    center, ring_r = _ring_geometry()
+    ring_rect = pygame.Rect(0, 0, ring_r*2 + 8, ring_r*2 + 8); ring_rect.center = center
+    sub = title_text if editing_title else (custom_subtitle.strip() or engine.mode)
+    regions = [
+        ("title", pygame.Rect(0, 0, WIDTH, TITLE_H),
+         (bool(cust_btn_rect and cust_btn_rect.collidepoint(mouse)),
+          bool(reset_btn_rect and reset_btn_rect.collidepoint(mouse)))),
+        ("left_controls", pygame.Rect(LEFT.x, LEFT.y, LEFT.width, stop_btn.rect.bottom + 4 - LEFT.y),
+         (engine.mode, tuple(b.hit(mouse) for b in buttons), tuple(b.press_anim for b in buttons))),
+        ("left_ring", ring_rect,
+         (fmt_time(engine.remaining), int(_ring_progress() * RING_QUANT), engine.mode, sub)),
+        ("right", RIGHT.inflate(2, 2),
+         (tuple((t.get("title", ""), bool(t.get("done"))) for t in tasks_model["tasks"]),
+          tasks_model.get("hide_completed"), adding_task, new_task, adding_task and caret_vis,
+          _hover_index(ui_task_rows, mouse))),
+        ("footer", _footer_rect(), (cnt.pomodoros, cnt.short_breaks, cnt.long_breaks)),
+        ("music_btn", _music_btn or pygame.Rect(WIDTH - 116, HEIGHT - 48, 100, 32),
+         (bool(_music_btn and _music_btn.collidepoint(mouse)), music_popup_open)),
+        # Opening/closing any overlay or changing the settings it shows repaints everything.
+        ("overlays", None,
+         (cust_menu_open, cust_flyout_open, _show_custom_panel, reset_confirm_open, tasks_menu_open,
+          music_popup_open, cfg.focus_level, cfg.auto_start_pomodoros, cfg.auto_start_breaks, cfg.mute,
+          cfg.custom_pomodoro_min, cfg.custom_short_min, cfg.custom_long_min, tasks_model.get("hide_completed"))),
+    ]
+    if cust_menu_rect:
+        regions.append(("cust_menu", cust_menu_rect, _hover_index(__cust_items, mouse)))
+    if cust_flyout_rect:
+        regions.append(("cust_flyout", cust_flyout_rect, _hover_index(__cust_fly_items, mouse)))
+    if reset_confirm_open and reset_confirm_items:
+        regions.append(("reset_confirm", reset_confirm_items[0][0].unionall([r for r, _ in reset_confirm_items]),
+                        _hover_index(reset_confirm_items, mouse)))
+    if tasks_menu_rect:
+        regions.append(("tasks_menu", tasks_menu_rect, _hover_index(tasks_menu_items, mouse)))
+    if _music_panel:
+        elapsed = _music_elapsed()
+        total = _music_total_guess if _music_total_guess > 0 else max(elapsed, 1.0)
+        fill_w = int(_music_seek_rect.width * max(0.0, min(1.0, elapsed / total))) if _music_seek_rect else 0
+        regions.append(("music_popup", _music_panel,
+                        (_music_idx, len(_playlist), SCANNER.done, _music_playing, int(elapsed), int(total), fill_w, _music_volume,
+                         _hover_index(((_music_play_rect,), (_music_next_rect,)), mouse))))
+    return regions
+
+def _draw_left_card(mouse, dt):
     draw_shadow(LEFT, offset=(6,6), radius=12, alpha=28)
     pygame.draw.rect(SCREEN, CARD, LEFT, border_radius=12)
     pygame.draw.rect(SCREEN, BORDER, LEFT, width=1, border_radius=12)
-    draw_left(pygame.mouse.get_pos(), dt)
+    draw_left(mouse, dt)
 
+def _draw_right_card(mouse, dt):
     draw_shadow(RIGHT, offset=(6,6), radius=12, alpha=20)
-    draw_right(pygame.mouse.get_pos(), dt)
+    draw_right(mouse, dt)
 
-    draw_customize_menu(pygame.mouse.get_pos())
-    draw_customize_flyout(pygame.mouse.get_pos())
-    draw_reset_confirm(pygame.mouse.get_pos())
-
-    foot = FONT_UI.render(f"Pomodoros: {cnt.pomodoros} Short: {cnt.short_breaks} Long: {cnt.long_breaks}", True, MUTED)
+def _draw_footer():
+    foot = render_text(FONT_UI, f"Pomodoros: {cnt.pomodoros} Short: {cnt.short_breaks} Long: {cnt.long_breaks}", True, MUTED)
     fx = LEFT.x + (LEFT.width - foot.get_width()) // 2
     fy = HEIGHT - foot.get_height() - 8 - 28
     SCREEN.blit(foot, (fx, fy))
 
-    _draw_music_toggle()
-    _draw_music_popup()
+def draw_frame(mouse, dt, timings=None):
+    """
+    Paint every layer of the UI onto SCREEN, back to front.
+
+    Parameters:
+    - mouse (tuple): mouse position used for hover states
+    - dt (float): seconds since the last frame, drives press animations
+    - timings (dict or None): if given, per-layer durations in seconds are
+      appended to timings[layer_name]
+    """
+    layers = (
+        ("draw_background", draw_background, ()),
+        ("draw_title_bar", draw_title_bar, ()),
+        ("draw_left", _draw_left_card, (mouse, dt)),
+        ("draw_right", _draw_right_card, (mouse, dt)),
+        ("draw_customize_menu", draw_customize_menu, (mouse,)),
+        ("draw_customize_flyout", draw_customize_flyout, (mouse,)),
+        ("draw_reset_confirm", draw_reset_confirm, (mouse,)),
+        ("draw_footer", _draw_footer, ()),
+        ("_draw_music_toggle", _draw_music_toggle, ()),
+        ("_draw_music_popup", _draw_music_popup, ()),
+    )
+    for name, fn, args in layers:
+        if timings is None:
+            fn(*args)
+            continue
+        t0 = perf_counter()
+        fn(*args)
+        timings.setdefault(name, []).append(perf_counter() - t0)
+
+# ---------------- Frame pacing ----------------
+_last_input = monotonic()
+_INPUT_EVENTS = {pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                 pygame.MOUSEWHEEL, pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT}
+
+def _is_animating(now):
+    """
+    Whether something on screen needs full frame rate right now.
 
-    pygame.display.update()
-    CLOCK.tick(FPS)
+    Parameters:
+    - now (float): current time in seconds
+    Returns:
+    - bool: True while input is recent or a press animation runs
+    """
+    if now - _last_input < IDLE_AFTER:
+        return True
+    return any(b.press_anim > 0 for b in chips + [start_btn, stop_btn])
+
+def _idle_timeout_ms():
+    """
+    Milliseconds until something on screen next changes: the countdown's
+    displayed second or ring step, the task caret blink, or the music popup's
+    elapsed time and seek bar. Capped at 1000 / IDLE_FPS.
+
+    The session deadline coincides with the last displayed-second change, and
+    track ends, crossfades, volume ramps, scans and file changes arrive as
+    events that end the wait on their own.
+
+    Returns:
+    - int: timeout for pygame.event.wait
+    """
+    timeout = 1.0 / IDLE_FPS
+    if engine.running:
+        left = engine.remaining
+        frac = left % 1.0
+        timeout = min(timeout, frac if frac > 0 else 1.0)
+        total = engine._mode_seconds()
+        # Ring steps slower than a second are picked up by the per-second redraw.
+        if total and total / RING_QUANT < 1.0:
+            done = total - left
+            next_step = (int(done / total * RING_QUANT) + 1) * total / RING_QUANT
+            timeout = min(timeout, next_step - done)
+    if adding_task:
+        timeout = min(timeout, CARET_BLINK - caret_timer)
+    if music_popup_open and _music_playing:
+        elapsed = _music_elapsed()
+        timeout = min(timeout, 1.0 - elapsed % 1.0)
+        total = _music_total_guess
+        if total > 0 and _music_seek_rect and _music_seek_rect.width:
+            w = _music_seek_rect.width
+            next_px = (int(w * elapsed / total) + 1) * total / w
+            timeout = min(timeout, next_px - elapsed)
+    return max(1, int(math.ceil(timeout * 1000.0)))
+
+def _frame_wait(now):
+    """
+    Pace the main loop: tick at FPS while animating, otherwise block until an
+    event arrives or the next scheduled on-screen change.
+
+    Parameters:
+    - now (float): time the current frame started
+    Returns:
+    - list: event that woke an idle wait, to be handled next frame
+    """
+    if _is_animating(now):
+        CLOCK.tick(FPS)
+        return []
+    ev = pygame.event.wait(_idle_timeout_ms())
+    CLOCK.tick()
+    return [] if ev.type == pygame.NOEVENT else [ev]
+
+# ---------------- Headless benchmark ----------------
+BENCH_STATES = ("idle", "running", "tasks", "customize", "music")
+
+def _bench_apply_state(name):
+    global cust_menu_open, cust_flyout_open, _show_custom_panel, music_popup_open
+    cust_menu_open = name == "customize"
+    cust_flyout_open = "focus" if name == "customize" else None
+    _show_custom_panel = name == "customize"
+    music_popup_open = name == "music"
+    engine.set_mode("Pomodoro")
+    engine.running = name != "idle"
+    if name == "tasks":
+        tasks_model["tasks"] = [{"title": f"Benchmark task {i+1}", "done": i % 3 == 0} for i in range(14)]
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def run_bench(frames):
+    """
+    Render `frames` full frames for each scripted state in BENCH_STATES and
+    print per-state frame times and per-routine draw times.
+
+    Parameters:
+    - frames (int): frames to render per state
+    Returns:
+    - dict: {"states": {state: [frame seconds]}, "routines": {name: [seconds]}}
+    """
+    init_gui()
+    mouse = (0, 0)
+    dt = 1.0 / FPS
+    routines = {}
+    states = {}
+    for name in BENCH_STATES:
+        _bench_apply_state(name)
+        samples = states[name] = []
+        for _ in range(frames):
+            if engine.running:
+                engine.remaining = max(1.0, engine.remaining - dt * 7)
+            t0 = perf_counter()
+            draw_frame(mouse, dt, routines)
+            pygame.display.update()
+            samples.append(perf_counter() - t0)
+    print(f"{'state':<12}{'frames':>8}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, samples in states.items():
+        print(f"{name:<12}{len(samples):>8}{sum(samples)/len(samples)*1000:>10.3f}"
+              f"{_percentile(samples, 0.95)*1000:>10.3f}{max(samples)*1000:>10.3f}")
+    print()
+    print(f"{'routine':<24}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, samples in routines.items():
+        print(f"{name:<24}{sum(samples)/len(samples)*1000:>10.3f}"
+              f"{_percentile(samples, 0.95)*1000:>10.3f}{max(samples)*1000:>10.3f}")
+    print()
+    print("text cache:", TEXT_CACHE.stats())
+    return {"states": states, "routines": routines}
+
+# ---------------- Mixer latency measurement ----------------
+LATENCY_CLICK_MS = 20
+
+def _click_sound():
+    """A short square-wave click in the mixer's own format."""
+    freq, fmt, channels = pygame.mixer.get_init()
+    if fmt != -16: return None
+    n = freq * LATENCY_CLICK_MS // 1000
+    samples = array("h", [12000 if (i // 8) % 2 == 0 else -12000 for i in range(n) for _ in range(channels)])
+    return pygame.mixer.Sound(buffer=samples.tobytes())
+
+def measure_latency(trials):
+    """
+    Play a test click `trials` times through play_alarm(), with the click put
+    in place of the configured alarm, and report the start latency, for
+    tuning the mixer profile.
+
+    Only the application's share is measured: the time from the play_alarm()
+    call until the sound is on a mixer channel. What follows happens inside
+    SDL and the device and cannot be observed without a loopback, so it is
+    estimated as one mixer buffer (buffer / frequency), the audio SDL mixes
+    ahead of the output.
+
+    Parameters:
+    - trials (int): number of clicks
+    Returns:
+    - list[float]: measured play_alarm() call times in ms
+    """
+    cfg = load_config()
+    cfg.mute = False  # local copy; the click must play even if alarms are muted
+    profile = _mixer_profile(cfg)
+    if not init_mixer(cfg):
+        print("mixer could not be opened with", profile)
+        return []
+    freq, fmt, channels = pygame.mixer.get_init()
+    print(f"requested: {profile['frequency']} Hz, {profile['channels']} ch, buffer {profile['buffer']}")
+    print(f"opened:    {freq} Hz, {channels} ch, format {fmt}")
+    click = _click_sound()
+    if click is None:
+        print("unsupported mixer sample format", fmt)
+        return []
+    slot = cfg.alarm_index % len(ALARMS)
+    saved = ALARMS[slot]
+    ALARMS[slot] = click
+    calls = []
+    try:
+        for _ in range(trials):
+            t0 = perf_counter()
+            started = play_alarm(cfg)
+            t1 = perf_counter()
+            if started is None or not pygame.mixer.get_busy(): continue
+            calls.append((t1 - t0) * 1000)
+            while pygame.mixer.get_busy():
+                sleep(0.001)
+            sleep(0.05)
+    finally:
+        ALARMS[slot] = saved
+    if not calls:
+        print("no channel available for the test click")
+        return []
+    buffer_ms = cfg.mixer_buffer / freq * 1000
+    mid = _percentile(calls, 0.5)
+    print(f"{'clicks':<10}{'call ms':>10}{'p95 ms':>10}{'max ms':>10}{'buffer ms':>11}{'est. ms':>10}")
+    print(f"{len(calls):<10}{mid:>10.3f}{_percentile(calls, 0.95):>10.3f}{max(calls):>10.3f}"
+          f"{buffer_ms:>11.2f}{mid + buffer_ms:>10.2f}")
+    print("call: play_alarm() until the click is on a channel (measured); "
+          "buffer: SDL's mix-ahead (estimated); est.: call + buffer")
+    return calls
+
+# ---------------- Main loop ----------------
+def main(profile_startup=False):
+    """
+    Run the GUI until the window is closed.
+
+    Parameters:
+    - profile_startup (bool): print the startup budget table once the first
+      frame is on screen, then exit
+    """
+    global _last_input
+    STARTUP.t0 = perf_counter()
+    init_gui()
+    last = monotonic()
+    woken = []
+    first_frame = STARTUP.begin("first frame")
+
+    while True:
+        now = monotonic(); dt = now - last; last = now
+        events = woken + pygame.event.get()
+        if any(e.type in _INPUT_EVENTS for e in events):
+            _last_input = now
+        for event in events:
+            if event.type == pygame.QUIT:
+                save_counters(cnt)
+                pygame.quit(); sys.exit()
+            elif event.type == pygame.KEYDOWN:
+                handle_keydown(event)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                handle_mouse(event.pos)
+            elif event.type == MUSIC_END:
+                _music_on_end()
+            elif event.type == MUSIC_FADE:
+                _music_on_fade()
+            elif event.type == MUSIC_ENVELOPE:
+                _envelope_apply(monotonic())
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                compositor.invalidate()
+
+        if engine.tick():
+            _music_duck(play_alarm(cfg), now)
+            engine.on_complete(cnt)
+            save_counters(cnt)
+        _envelope_sync(now)
+
+        _poll_asset_changes()
+        _music_poll_scanner()
+        _music_poll_loader()
+
+        _tick_caret(dt)
+        mouse = pygame.mouse.get_pos()
+        dirty = compositor.collect(_frame_regions(mouse))
+        if dirty:
+            # Repaint the whole layer stack clipped to the changed area so overlays
+            # still composite correctly, then upload only the changed rects.
+            SCREEN.set_clip(dirty[0].unionall(dirty[1:]))
+            draw_frame(mouse, dt)
+            SCREEN.set_clip(None)
+            pygame.display.update(dirty)
+        if first_frame is not None:
+            STARTUP.end(first_frame); first_frame = None
+            if profile_startup:
+                STARTUP.report()
+                pygame.quit()
+                return
+        woken = _frame_wait(now)
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="PyModoro - Pomodoro timer and task tracker")
+    ap.add_argument("--headless", action="store_true", help="run on the SDL dummy video/audio drivers (no window)")
+    ap.add_argument("--bench", type=int, metavar="N", help="render N frames per scripted state headlessly and report timings")
+    ap.add_argument("--profile-startup", action="store_true", help="print a per-phase startup budget table after the first frame and exit")
+    ap.add_argument("--measure-latency", type=int, nargs="?", const=10, metavar="N",
+                    help="play N test clicks (default 10) through play_alarm() with the configured mixer profile and report start latency")
+    args = ap.parse_args()
+    if args.headless or args.bench:
+        use_headless_drivers()
+    if args.measure_latency:
+        measure_latency(args.measure_latency)
+        pygame.quit()
+        sys.exit(0)
+    if args.bench:
+        run_bench(args.bench)
+        pygame.quit()
+        sys.exit(0)
+    main(profile_startup=args.profile_startup)
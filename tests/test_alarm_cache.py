@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pomodoroapp as app
+
+class AlarmCacheTest(unittest.TestCase):
+    def setUp(self):
+        pygame.mixer.init()
+        self.addCleanup(pygame.mixer.quit)
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cache = self.tmp / "cache"
+        self.cache.mkdir()
+        self.alarm = self.tmp / "chime.mp3"
+        self.alarm.write_bytes(b"\0" * 16)
+        for name, value in (("CACHE_DIR", self.cache), ("ALARM_PATHS", [self.alarm, self.tmp / "gone.mp3"])):
+            patcher = mock.patch.object(app, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_prune_keeps_only_current_alarms(self):
+        current = app._alarm_cache_path(self.alarm)
+        current.write_bytes(b"")
+        stale = [self.cache / "chime-1-2-44100x2x16.wav", self.cache / "gone-1-2-44100x2x16.wav",
+                 self.cache / "chime.tmp"]
+        for p in stale:
+            p.write_bytes(b"")
+        other = self.cache / "notes.txt"
+        other.write_bytes(b"")
+        app._prune_alarm_cache()
+        self.assertEqual(sorted(self.cache.iterdir()), sorted([current, other]))
+
+if __name__ == "__main__":
+    unittest.main()
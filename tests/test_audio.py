@@ -0,0 +1,122 @@
+import struct
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from pomodoro_audio import TrackCache, probe_duration
+
+def _frame(br_idx=9, mono=False, body=b""):
+    """One MPEG-1 Layer III frame at 48 kHz; index 9 is 128 kbps (384 bytes), 5 is 64 kbps."""
+    header = bytes((0xFF, 0xFB, br_idx << 4 | 1 << 2, (3 if mono else 0) << 6))
+    size = 144 * (128000 if br_idx == 9 else 64000) // 48000
+    return (header + body).ljust(size, b"\0")
+
+def _id3v2(size=20, footer=False):
+    syncsafe = bytes((size >> 21 & 0x7F, size >> 14 & 0x7F, size >> 7 & 0x7F, size & 0x7F))
+    return b"ID3\x04\x00" + bytes((0x10 if footer else 0,)) + syncsafe + b"\0" * size + (b"3DI" + b"\0" * 7 if footer else b"")
+
+class TrackCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.track = self.tmp / "a.mp3"
+        self.track.write_bytes(b"\0" * 64)
+        self.cache = TrackCache(self.tmp / "cache.json")
+
+    def test_lookup_probes_once(self):
+        calls = []
+        probe = lambda p: calls.append(p) or 12.5
+        self.assertEqual(self.cache.duration(self.track, probe), 12.5)
+        self.assertEqual(self.cache.duration(self.track, probe), 12.5)
+        self.assertEqual(calls, [self.track])
+
+    def test_probe_runs_without_the_lock(self):
+        def probe(path):
+            # Another thread must be able to use the cache while a probe runs.
+            other = threading.Thread(target=self.cache.walk(self.tmp, {".mp3"}).__next__)
+            other.start()
+            other.join(timeout=2.0)
+            self.assertFalse(other.is_alive())
+            return 1.0
+        self.assertEqual(self.cache.duration(self.track, probe), 1.0)
+
+class ProbeDurationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def probe(self, name, data):
+        path = self.tmp / name
+        path.write_bytes(data)
+        return probe_duration(path)
+
+    def test_mp3_cbr_estimate(self):
+        frames = _frame() * 100  # 100 * 1152 samples at 48 kHz
+        self.assertAlmostEqual(self.probe("a.mp3", frames), 2.4)
+
+    def test_mp3_skips_id3v2_id3v1_and_footer(self):
+        frames = _frame() * 100
+        id3v1 = b"TAG" + b"\0" * 125
+        self.assertAlmostEqual(self.probe("a.mp3", _id3v2() + frames + id3v1), 2.4)
+        self.assertAlmostEqual(self.probe("b.mp3", _id3v2(footer=True) + frames), 2.4)
+
+    def test_mp3_xing_and_info(self):
+        xing = b"\0" * 32 + b"Xing" + struct.pack(">II", 1, 1000)
+        self.assertAlmostEqual(self.probe("a.mp3", _frame(body=xing) + _frame() * 3), 24.0)
+        info = b"\0" * 17 + b"Info" + struct.pack(">II", 1, 500)
+        self.assertAlmostEqual(self.probe("b.mp3", _frame(mono=True, body=info) + _frame(mono=True) * 3), 12.0)
+
+    def test_mp3_xing_without_frame_count_falls_back(self):
+        xing = b"\0" * 32 + b"Xing" + struct.pack(">II", 0, 1000)
+        self.assertAlmostEqual(self.probe("a.mp3", _frame(body=xing) + _frame() * 99), 2.4)
+
+    def test_mp3_vbri(self):
+        vbri = b"\0" * 32 + b"VBRI" + b"\0" * 10 + struct.pack(">I", 2000)
+        self.assertAlmostEqual(self.probe("a.mp3", _frame(body=vbri) + _frame() * 3), 48.0)
+
+    def test_mp3_untagged_vbr_walks_frames(self):
+        frames = (_frame(9) + _frame(5)) * 50
+        self.assertAlmostEqual(self.probe("a.mp3", frames), 2.4)
+
+    def test_mp3_garbage_and_truncated(self):
+        self.assertEqual(self.probe("a.mp3", b""), 0.0)
+        self.assertEqual(self.probe("b.mp3", bytes(range(0xFF)) * 40), 0.0)
+        self.assertEqual(self.probe("c.mp3", _frame()[:4]), 0.0)
+        self.assertEqual(self.probe("d.mp3", _id3v2(size=5000)[:100]), 0.0)
+
+    def test_wav_chunks(self):
+        fmt = struct.pack("<HHIIHH", 1, 2, 44100, 44100 * 4, 4, 16)
+        data = b"\0" * (44100 * 4 * 2)
+        body = (b"WAVE" + b"fmt " + struct.pack("<I", 16) + fmt
+                + b"LIST" + struct.pack("<I", 3) + b"abc\0"   # odd chunk, padded
+                + b"data" + struct.pack("<I", len(data)) + data)
+        self.assertAlmostEqual(self.probe("a.wav", b"RIFF" + struct.pack("<I", len(body)) + body), 2.0)
+
+    def test_wav_garbage_and_truncated(self):
+        self.assertEqual(self.probe("a.wav", b"RIFX" + b"\0" * 40), 0.0)
+        self.assertEqual(self.probe("b.wav", b"RIFF\0\0\0\0WAVEfmt "), 0.0)
+        no_fmt = b"RIFF\0\0\0\0WAVE" + b"data" + struct.pack("<I", 100) + b"\0" * 100
+        self.assertEqual(self.probe("c.wav", no_fmt), 0.0)
+
+    def _ogg(self, codec_header, granule):
+        first = b"OggS\x00\x02" + b"\0" * 22 + codec_header
+        last = b"OggS\x00\x04" + struct.pack("<q", granule) + b"\0" * 14
+        return first + b"\0" * 1000 + last
+
+    def test_ogg_vorbis_granule(self):
+        vorbis = b"\x01vorbis" + struct.pack("<IBI", 0, 2, 44100)
+        self.assertAlmostEqual(self.probe("a.ogg", self._ogg(vorbis, 441000)), 10.0)
+
+    def test_ogg_opus_granule_minus_preskip(self):
+        opus = b"OpusHead" + struct.pack("<BBHI", 1, 2, 312, 44100)
+        self.assertAlmostEqual(self.probe("a.ogg", self._ogg(opus, 3 * 48000 + 312)), 3.0)
+
+    def test_ogg_garbage_and_unknown_codec(self):
+        self.assertEqual(self.probe("a.ogg", b"RIFF" + b"\0" * 100), 0.0)
+        self.assertEqual(self.probe("b.ogg", self._ogg(b"\x7fFLAC", 48000)), 0.0)
+        self.assertEqual(self.probe("c.ogg", b"OggS"), 0.0)
+
+    def test_unknown_suffix(self):
+        self.assertEqual(self.probe("a.flac", _frame() * 10), 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from pomodoro_core import Config, Counters, TimerEngine
+from pomodoro_sched import _FakeClock
+
+class TimerEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = _FakeClock()
+        self.cfg = Config(pomodoro_min=25, short_min=5, long_min=15)
+        self.engine = TimerEngine(self.cfg, clock=self.clock)
+
+    def test_pause_resume_keeps_remainder(self):
+        self.engine.start()
+        self.clock.t = 100.0
+        self.engine.pause()
+        self.assertEqual(self.engine.remaining, 1400.0)
+        self.assertIsNone(self.engine.deadline)
+        self.clock.t = 5000.0  # time spent paused does not count
+        self.assertEqual(self.engine.remaining, 1400.0)
+        self.engine.start()
+        self.assertEqual(self.engine.deadline, 6400.0)
+        self.clock.t = 5400.0
+        self.assertEqual(self.engine.remaining, 1000.0)
+
+    def test_assigning_remaining_moves_deadline(self):
+        self.engine.start()
+        self.clock.t = 10.0
+        self.engine.remaining = 30.0
+        self.assertTrue(self.engine.running)
+        self.assertEqual(self.engine.deadline, 40.0)
+        self.clock.t = 39.9
+        self.assertFalse(self.engine.tick())
+        self.clock.t = 40.0
+        self.assertTrue(self.engine.tick())
+
+    def test_long_stall_completes_once_without_overshoot(self):
+        self.engine.start()
+        self.clock.t = 10 * 3600.0  # e.g. the machine slept through the deadline
+        self.assertEqual(self.engine.remaining, 0.0)
+        self.assertTrue(self.engine.tick())
+        self.assertFalse(self.engine.tick())
+        self.assertFalse(self.engine.running)
+        self.assertEqual(self.engine.remaining, 0)
+
+    def test_auto_start_sets_a_fresh_deadline(self):
+        self.cfg.auto_start_breaks = True
+        counters = Counters()
+        self.engine.start()
+        self.clock.t = 1600.0  # 100 s late
+        self.assertTrue(self.engine.tick())
+        self.engine.on_complete(counters)
+        self.assertEqual(counters.pomodoros, 1)
+        self.assertEqual(self.engine.mode, "Short Break")
+        self.assertEqual(self.engine.deadline, 1600.0 + 5 * 60)
+        self.assertEqual(self.engine.remaining, 5 * 60)
+
+    def test_without_auto_start_next_mode_waits(self):
+        counters = Counters()
+        self.engine.start()
+        self.clock.t = 1500.0
+        self.assertTrue(self.engine.tick())
+        self.engine.on_complete(counters)
+        self.assertEqual(self.engine.mode, "Short Break")
+        self.assertFalse(self.engine.running)
+        self.assertEqual(self.engine.remaining, 5 * 60)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import signal
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pomodoro_core
+import pomodoro_daemon
+from pomodoro_core import Config, Counters
+
+class PomodoroDaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.sock = self.tmp / "pomodoro.sock"
+        self.counters_file = self.tmp / "counters.csv"
+        patcher = mock.patch.object(pomodoro_core, "COUNTERS_FILE", self.counters_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, scenario, stop_with_signal=False):
+        """Run scenario(daemon, connect) against a live daemon inside asyncio.run()."""
+        daemon = pomodoro_daemon.PomodoroDaemon(Config(), Counters())
+
+        async def connect():
+            return await asyncio.open_unix_connection(str(self.sock))
+
+        async def main():
+            task = asyncio.create_task(daemon.serve(self.sock))
+            while not self.sock.exists():
+                await asyncio.sleep(0.01)
+            try:
+                return await asyncio.wait_for(scenario(daemon, connect), 10)
+            finally:
+                os.kill(os.getpid(), signal.SIGTERM)
+                await asyncio.wait_for(task, 5)
+
+        return asyncio.run(main())
+
+    @staticmethod
+    async def _ask(reader, writer, line):
+        writer.write((line + "\n").encode())
+        await writer.drain()
+        return (await reader.readline()).decode().rstrip("\n")
+
+    def test_command_replies(self):
+        async def scenario(daemon, connect):
+            reader, writer = await connect()
+            replies = [await self._ask(reader, writer, line)
+                       for line in ("status", "start", "pause", "skip", "skip pomodoro", "bogus", "skip sideways", "")]
+            writer.close()
+            return replies
+
+        replies = self._run(scenario)
+        self.assertEqual(replies[0], "ok mode=pomodoro running=0 remaining=1500 pomodoros=0 short=0 long=0")
+        self.assertTrue(replies[1].startswith("ok mode=pomodoro running=1 "))
+        self.assertTrue(replies[2].startswith("ok mode=pomodoro running=0 "))
+        self.assertTrue(replies[3].startswith("ok mode=short running=1 "))
+        self.assertTrue(replies[4].startswith("ok mode=pomodoro running=1 "))
+        self.assertEqual(replies[5], "err unknown command 'bogus'")
+        self.assertEqual(replies[6], "err unknown skip target 'sideways'")
+        self.assertEqual(replies[7], "err empty command")
+
+    def test_watch_events_follow_the_reply(self):
+        async def scenario(daemon, connect):
+            watch_r, watch_w = await connect()
+            other_r, other_w = await connect()
+            lines = [await self._ask(watch_r, watch_w, "watch"),
+                     await self._ask(watch_r, watch_w, "start"),
+                     (await watch_r.readline()).decode().rstrip("\n")]
+            await self._ask(other_r, other_w, "pause")
+            lines.append((await watch_r.readline()).decode().rstrip("\n"))
+            await self._ask(other_r, other_w, "start")
+            lines.append((await watch_r.readline()).decode().rstrip("\n"))
+            daemon.engine.remaining = 0.05
+            daemon._arm()
+            lines.append((await watch_r.readline()).decode().rstrip("\n"))
+            watch_w.close()
+            other_w.close()
+            return lines
+
+        lines = self._run(scenario)
+        self.assertTrue(lines[0].startswith("ok mode=pomodoro running=0"))
+        self.assertTrue(lines[1].startswith("ok mode=pomodoro running=1"))
+        self.assertTrue(lines[2].startswith("event start mode=pomodoro running=1"))
+        self.assertTrue(lines[3].startswith("event pause "))
+        self.assertTrue(lines[4].startswith("event start "))
+        self.assertTrue(lines[5].startswith("event complete mode=short running=0 remaining=300 pomodoros=1"))
+
+    def test_sigterm_saves_counters_and_removes_socket(self):
+        async def scenario(daemon, connect):
+            daemon.counters.pomodoros = 3
+            daemon.counters.long_breaks = 1
+
+        self._run(scenario)
+        self.assertFalse(self.sock.exists())
+        rows = self.counters_file.read_text(encoding="utf-8").split()
+        self.assertEqual(rows, ["pomodoros,short_breaks,long_breaks", "3,0,1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pomodoroapp as app
+from pomodoro_core import Config
+
+class PlaylistTest(unittest.TestCase):
+    def setUp(self):
+        state = {
+            "cfg": Config(music_shuffle=False),
+            "_music_idx": 0,
+            "_music_loaded": None,
+            "_music_pending": None,
+            "_music_prefetched": None,
+            "_music_queued": None,
+        }
+        for name, value in state.items():
+            patcher = mock.patch.object(app, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for name in ("_playlist", "_playlist_known"):
+            patcher = mock.patch.object(app, name, type(getattr(app, name))())
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.requests = []
+        patcher = mock.patch.object(app.LOADER, "request", lambda i, p: self.requests.append((i, p)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracks = [Path("/music") / f"{c}.mp3" for c in "abcde"]
+        for p in self.tracks:
+            app._playlist_add(p)
+
+    def _playing(self, index):
+        app._music_idx = index
+        app._music_loaded = (index, app._playlist[index], None, 0.0)
+
+    def test_add_ignores_duplicates(self):
+        app._playlist_add(self.tracks[1])
+        self.assertEqual(app._playlist, self.tracks)
+
+    def test_remove_before_current_keeps_current(self):
+        self._playing(2)
+        app._playlist_remove(self.tracks[0])
+        self.assertEqual(app._playlist, self.tracks[1:])
+        self.assertEqual(app._playlist[app._music_idx], self.tracks[2])
+        self.assertEqual(app._music_loaded[0], 1)
+
+    def test_remove_folder(self):
+        self._playing(0)
+        sub = [Path("/music/sub") / f"{c}.mp3" for c in "xy"]
+        for p in sub:
+            app._playlist_add(p)
+        app._playlist_remove(Path("/music/sub"))
+        self.assertEqual(app._playlist, self.tracks)
+        self.assertEqual(app._playlist_known, set(self.tracks))
+
+    def test_remove_current_keeps_successor_next(self):
+        self._playing(2)
+        app._playlist_remove(self.tracks[2])
+        nxt = (app._music_idx + 1) % len(app._playlist)
+        self.assertEqual(app._playlist[nxt], self.tracks[3])
+        self.assertEqual(self.requests[-1], (nxt, self.tracks[3]))
+
+    def test_remove_current_first_track_wraps(self):
+        self._playing(0)
+        app._playlist_remove(self.tracks[0])
+        self.assertEqual(app._music_idx, len(app._playlist) - 1)
+        self.assertEqual(app._playlist[(app._music_idx + 1) % len(app._playlist)], self.tracks[1])
+
+    def test_remove_pending_current_loads_successor(self):
+        app._music_idx = app._music_pending = 2
+        app._playlist_remove(self.tracks[2])
+        self.assertEqual(app._playlist[app._music_idx], self.tracks[3])
+        self.assertEqual(app._music_pending, app._music_idx)
+        self.assertIn((app._music_idx, self.tracks[3]), self.requests)
+
+    def _queued_next(self, index, music):
+        """Play track index with its successor handed to the mixer queue."""
+        self._playing(index)
+        nxt = index + 1
+        app._music_queued = app._music_prefetched = (nxt, app._playlist[nxt], b"next", 0.0)
+        music.get_pos.return_value = 4000  # 4 s into the current track
+
+    def _patch_mixer(self):
+        music = mock.MagicMock()
+        patchers = [mock.patch.object(app.pygame.mixer, "music", music),
+                    mock.patch.object(app, "MUSIC_CLOCK", app.PlaybackClock()),
+                    mock.patch.object(app, "_music_playing", True)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return music
+
+    def test_remove_queued_track_reloads_current_at_its_position(self):
+        music = self._patch_mixer()
+        self._queued_next(1, music)
+        app._playlist_remove(self.tracks[2])
+        self.assertIsNone(app._music_queued)
+        self.assertEqual(app._playlist[app._music_idx], self.tracks[1])
+        music.load.assert_called_once()
+        music.play.assert_called_once_with(start=4.0)
+        music.pause.assert_not_called()
+        # The new successor is fetched to take the queued track's place.
+        self.assertEqual(self.requests[-1], (2, self.tracks[3]))
+
+    def test_remove_queued_track_while_paused_stays_paused(self):
+        music = self._patch_mixer()
+        app._music_playing = False
+        self._queued_next(1, music)
+        app._playlist_remove(self.tracks[2])
+        music.play.assert_called_once_with(start=4.0)
+        music.pause.assert_called_once_with()
+
+    def test_remove_other_track_keeps_queue(self):
+        music = self._patch_mixer()
+        self._queued_next(1, music)
+        app._playlist_remove(self.tracks[4])
+        self.assertEqual(app._music_queued[1], self.tracks[2])
+        music.load.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from pomodoro_core import Config, Counters, TimerEngine
+from pomodoro_sched import TimerWheel, _FakeClock
+
+class TimerWheelTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = _FakeClock()
+        self.wheel = TimerWheel(tick=0.1, slots=8, levels=3, clock=self.clock)
+        self.engine = TimerEngine(Config(), clock=self.clock)
+        self.counters = Counters()
+
+    def _advance_to(self, t):
+        self.clock.t = t
+        return self.wheel.advance()
+
+    def test_expiry_completes_with_counters(self):
+        self.engine.remaining = 5.0
+        self.engine.start()
+        self.wheel.schedule(self.engine, self.counters)
+        self.assertEqual(self._advance_to(4.9), [])
+        self.assertEqual(self._advance_to(5.0), [self.engine])
+        self.assertEqual(self.counters.pomodoros, 1)
+        self.assertNotIn(self.engine, self.wheel)
+
+    def test_pause_resume_then_expire(self):
+        self.engine.remaining = 2.0
+        self.engine.start()
+        self.wheel.schedule(self.engine, self.counters)
+        self._advance_to(1.0)
+        self.engine.pause()
+        # The paused engine is dropped when its old slot comes up.
+        self.assertEqual(self._advance_to(3.0), [])
+        self.assertNotIn(self.engine, self.wheel)
+        self.engine.start()
+        self.wheel.schedule(self.engine, self.counters)
+        self.assertEqual(self._advance_to(3.9), [])
+        self.assertEqual(self._advance_to(4.0), [self.engine])
+        self.assertEqual(self.counters.pomodoros, 1)
+        self.assertEqual(self.engine.mode, "Short Break")
+
+    def test_far_deadline_cascades_down(self):
+        self.engine.remaining = 25 * 60.0
+        self.engine.start()
+        self.wheel.schedule(self.engine, self.counters)
+        self.assertEqual(self._advance_to(25 * 60.0 - 0.1), [])
+        self.assertEqual(self._advance_to(25 * 60.0), [self.engine])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import base64
+import json
+import os
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pomodoro_server
+
+async def _ws_connect(addr, path):
+    reader, writer = await asyncio.open_connection(*addr)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: test\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 101"), head
+    return reader, writer
+
+async def _ws_recv(reader):
+    _, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        n = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", await reader.readexactly(8))[0]
+    return json.loads(await reader.readexactly(n))
+
+def _ws_send(writer, obj):
+    payload = json.dumps(obj).encode()
+    mask = os.urandom(4)
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    writer.write(struct.pack("!BB", 0x81, 0x80 | len(payload)) + mask + masked)
+
+class TimerServerTest(unittest.TestCase):
+    def setUp(self):
+        tmp = Path(tempfile.mkdtemp())
+        patcher = mock.patch.object(pomodoro_server, "USERS_FILE", tmp / "users.json")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, scenario, **kwargs):
+        """Run scenario(server, addr) against a live server inside asyncio.run()."""
+        kwargs.setdefault("granularity", 0)
+        server = pomodoro_server.TimerServer(tick=0.02, **kwargs)
+
+        async def main():
+            bound = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(server.serve("127.0.0.1", 0, started=bound.set_result))
+            addr = await asyncio.wait_for(bound, 5)
+            try:
+                return await asyncio.wait_for(scenario(server, addr), 10)
+            finally:
+                server.close()
+                await task
+
+        return asyncio.run(main())
+
+    def test_completion_is_pushed_end_to_end(self):
+        async def scenario(server, addr):
+            reader, writer = await _ws_connect(addr, "/ws?user=alice")
+            self.assertEqual((await _ws_recv(reader))["updates"][0]["event"], "hello")
+            _ws_send(writer, {"cmd": "start", "user": "alice"})
+            await writer.drain()
+            self.assertEqual((await _ws_recv(reader))["updates"][0]["event"], "start")
+            u = server.users["alice"]
+            u.engine.remaining = 0.1
+            server.wheel.schedule(u.engine, u.counters)
+            update = (await _ws_recv(reader))["updates"][0]
+            writer.close()
+            return update
+
+        update = self._run(scenario)
+        self.assertEqual(update["event"], "complete")
+        self.assertEqual(update["pomodoros"], 1)
+        self.assertEqual(update["mode"], "short")
+
+    def test_board_pushes_are_batched(self):
+        async def scenario(server, addr):
+            board, board_w = await _ws_connect(addr, "/ws")
+            await _ws_recv(board)
+            reader, writer = await _ws_connect(addr, "/ws")
+            await _ws_recv(reader)
+            for uid in ("a", "b", "c"):
+                _ws_send(writer, {"cmd": "start", "user": uid})
+            await writer.drain()
+            message = await _ws_recv(board)
+            board_w.close()
+            writer.close()
+            return message
+
+        message = self._run(scenario)
+        self.assertEqual([u["user"] for u in message["updates"]], ["a", "b", "c"])
+
+    def test_tick_does_not_replace_a_pending_start(self):
+        async def scenario(server, addr):
+            reader, writer = await _ws_connect(addr, "/ws?user=alice")
+            await _ws_recv(reader)
+            loop = asyncio.get_running_loop()
+            # Send the start about 10 ms before the ticker's next boundary.
+            await asyncio.sleep(server.granularity - loop.time() % server.granularity - 0.01)
+            _ws_send(writer, {"cmd": "start", "user": "alice"})
+            await writer.drain()
+            update = (await _ws_recv(reader))["updates"][0]
+            writer.close()
+            return update
+
+        update = self._run(scenario, granularity=0.2)
+        self.assertEqual(update["event"], "start")
+        self.assertTrue(update["running"])
+
+    async def _claim_users(self, server, addr):
+        """Ask for users a, b, c, a over one connection, then subscribe to d on another."""
+        reader, writer = await _ws_connect(addr, "/ws")
+        await _ws_recv(reader)
+        replies = []
+        for uid in ("a", "b", "c", "a"):
+            _ws_send(writer, {"cmd": "status", "user": uid})
+            replies.append(await _ws_recv(reader))
+        other, other_w = await _ws_connect(addr, "/ws?user=d")
+        replies.append(await _ws_recv(other))
+        writer.close()
+        other_w.close()
+        return replies
+
+    def test_per_connection_user_cap(self):
+        replies = self._run(self._claim_users, max_users=3, max_users_per_connection=2)
+        self.assertEqual([r["type"] for r in replies], ["state", "state", "error", "state", "state"])
+        self.assertIn("this connection", replies[2]["message"])
+
+    def test_global_user_cap(self):
+        replies = self._run(self._claim_users, max_users=2, max_users_per_connection=5)
+        self.assertEqual([r["type"] for r in replies], ["state", "state", "error", "state", "error"])
+        self.assertEqual(replies[4]["message"], "user limit reached")
+
+if __name__ == "__main__":
+    unittest.main()